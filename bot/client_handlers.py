@@ -11,67 +11,236 @@ All handlers are async and designed for python-telegram-bot v21.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import json
 import logging
-import os
-import tempfile
+import re
+import time
+import weakref
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes, ConversationHandler
 
 from bot.config import MessageTemplates
 from core.container import Container
 from core.middleware import with_middleware
+from core.realtor_cache import (
+    get_all_realtors_cached,
+    get_realtor_cached,
+    invalidate_realtor_clients,
+)
 from database.models import ClientModel
+from utils.extractors import (
+    CONFIDENT_FIELDS,
+    REQUIRED_FIELDS,
+    regex_extract,
+    unrecognised_word_count,
+)
 from utils.helpers import sanitize_user_text
 
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import. The accessors still go through the Container
+# singletons, so `Container.reset()` keeps working.
+_repo = Container.get_repository
+_llm = Container.get_llm_service
+
+
+@dataclass(slots=True)
+class ClientInfoDraft:
+    """Client data collected during the dialog (`context.user_data["client_info"]`).
+
+    Field names match `ClientModel`, so a draft converts with `asdict()`.
+    """
+
+    telegram_id: int
+    realtor_id: int = 0
+    telegram_username: Optional[str] = None
+    name: str = ""
+    budget: str = ""
+    size: str = ""
+    location: str = ""
+    rooms: str = ""
+    ready_status: str = ""
+    contact: str = ""
+    notes: str = ""
+
+    @classmethod
+    def from_client(cls, client: ClientModel) -> "ClientInfoDraft":
+        """Restore a draft from a saved client record."""
+        return cls(
+            telegram_id=client.telegram_id,
+            realtor_id=client.realtor_id,
+            telegram_username=client.telegram_username,
+            name=client.name,
+            budget=client.budget,
+            size=client.size,
+            location=client.location,
+            rooms=client.rooms,
+            ready_status=client.ready_status,
+            contact=client.contact,
+            notes=client.notes,
+        )
+
+    def fill_missing(self, values: Dict[str, str]) -> bool:
+        """Set fields that are still empty; return True if any field was set."""
+        filled = False
+        for field, value in values.items():
+            if value and not getattr(self, field):
+                setattr(self, field, value)
+                filled = True
+        return filled
+
+    def has_required_fields(self) -> bool:
+        """Check whether all fields from `REQUIRED_FIELDS` are filled."""
+        return all(getattr(self, field) for field in REQUIRED_FIELDS)
+
 
 # Fallback structured questionnaire when LLM is unavailable.
-_QUESTIONNAIRE: list[tuple[str, str]] = [
-    (
-        "budget",
-        "Какой у вас бюджет? 💰\n\nНапишите сумму в лари (GEL):\n• до 150 000\n• 100-200 тысяч\n• от 200 000",
-    ),
-    (
-        "size",
-        "Какая минимальная площадь вас интересует? 📐\n\nУкажите в м²:\n• от 50\n• 60-80\n• минимум 70",
-    ),
-    (
-        "location",
-        "Какой район Батуми вы рассматриваете? 🗺\n\nПримеры: Старый Батуми, Новый бульвар, Махинджаури, Гонио, Кобулети.",
-    ),
-    (
-        "rooms",
-        "Сколько комнат нужно? 🛏\n\n• Студия\n• 1 спальня\n• 2 спальни\n• 3 спальни\n• 4+ спальни",
-    ),
-    (
-        "ready_status",
-        "Какая стадия строительства вас интересует? 🏗\n\n• Готовое\n• Строящееся (white/black frame)\n• Котлован\n• Рассмотрю всё",
-    ),
-    (
-        "contact",
-        "Когда вам удобно, чтобы я позвонила? 📞\n\nНапишите:\n• Сейчас можно\n• Через час\n• После 18:00\n• Лучше пишите в Telegram",
-    ),
-    (
-        "notes",
-        "Дополнительные пожелания? 📝\n\nНапример: этаж, вид, паркинг, расстояние до моря.\nИли напишите «нет».",
-    ),
-]
-
-
-async def _is_realtor(user_id: int) -> bool:
-    repo = Container.get_repository()
-    return (await repo.get_realtor(user_id)) is not None
+# Stored as parallel tuples (field name / question text) indexed by step.
+_QUESTION_FIELDS: tuple[str, ...] = (
+    "budget",
+    "size",
+    "location",
+    "rooms",
+    "ready_status",
+    "contact",
+    "notes",
+)
+_QUESTION_TEXTS: tuple[str, ...] = (
+    "Какой у вас бюджет? 💰\n\nНапишите сумму в лари (GEL):\n• до 150 000\n• 100-200 тысяч\n• от 200 000",
+    "Какая минимальная площадь вас интересует? 📐\n\nУкажите в м²:\n• от 50\n• 60-80\n• минимум 70",
+    "Какой район Батуми вы рассматриваете? 🗺\n\nПримеры: Старый Батуми, Новый бульвар, Махинджаури, Гонио, Кобулети.",
+    "Сколько комнат нужно? 🛏\n\n• Студия\n• 1 спальня\n• 2 спальни\n• 3 спальни\n• 4+ спальни",
+    "Какая стадия строительства вас интересует? 🏗\n\n• Готовое\n• Строящееся (white/black frame)\n• Котлован\n• Рассмотрю всё",
+    "Когда вам удобно, чтобы я позвонила? 📞\n\nНапишите:\n• Сейчас можно\n• Через час\n• После 18:00\n• Лучше пишите в Telegram",
+    "Дополнительные пожелания? 📝\n\nНапример: этаж, вид, паркинг, расстояние до моря.\nИли напишите «нет».",
+)
+_QUESTION_COUNT = len(_QUESTION_FIELDS)
+
+
+# Fields copied from the LLM extraction result into the client draft.
+_EXTRACTABLE_FIELDS: tuple[str, ...] = (
+    "budget",
+    "size",
+    "location",
+    "rooms",
+    "ready_status",
+    "contact",
+    "notes",
+)
+
+# Labels for the "already known" note appended to each LLM call.
+_CLIENT_MEMORY_LABELS: tuple[tuple[str, str], ...] = (
+    ("budget", "Бюджет"),
+    ("size", "Площадь"),
+    ("location", "Район"),
+    ("rooms", "Комнаты"),
+    ("ready_status", "Стадия"),
+    ("notes", "Пожелания"),
+)
+
+
+def _client_memory_message(client_info: ClientInfoDraft) -> Optional[Dict[str, str]]:
+    """Build a note with what is already known about the client.
+
+    It is appended to the messages of a single call and never stored in the
+    conversation, so the history prefix stays byte-identical between turns.
+    """
+    known = [
+        f"{label}: {value}"
+        for field, label in _CLIENT_MEMORY_LABELS
+        if (value := getattr(client_info, field))
+    ]
+    if not known:
+        return None
+    return {"role": "system", "content": f"Уже известно о клиенте: {', '.join(known)}"}
+
+
+def _with_client_memory(conversation: list, client_info: ClientInfoDraft) -> list:
+    """Return messages for an LLM call: history + trailing client memory."""
+    memory = _client_memory_message(client_info)
+    return conversation + [memory] if memory else conversation
+
+
+# History window sent to the LLM. Older turns are dropped: the facts they
+# contained are already in the client draft and reach the model through
+# `_client_memory_message()`. Chars / 4 is a rough token estimate.
+_CONVERSATION_MAX_MESSAGES = 16
+_CONVERSATION_MAX_CHARS = 12_000
+
+
+def _trim_conversation(conversation: list) -> None:
+    """Drop the oldest turns in place, keeping the realtor system turn at index 0.
+
+    Trimming goes down to half the window at once, so the history prefix stays
+    unchanged (and cacheable by the provider) for the following turns.
+    """
+    keep = _CONVERSATION_MAX_MESSAGES // 2
+    if len(conversation) > _CONVERSATION_MAX_MESSAGES:
+        del conversation[1:-keep]
+
+    total = sum(len(message["content"]) for message in conversation)
+    while total > _CONVERSATION_MAX_CHARS and len(conversation) > 2:
+        total -= len(conversation.pop(1)["content"])
 
 
 async def _get_realtor_by_id(realtor_id: int) -> Optional[Any]:
     """Get realtor by specific ID."""
-    repo = Container.get_repository()
-    return await repo.get_realtor(realtor_id)
+    return await get_realtor_cached(realtor_id)
+
+
+# Round-robin position. Kept in memory and persisted to a small file with a
+# debounce, so a burst of /start commands results in a single write.
+_ROUND_ROBIN_TRACKER_PATH = Path("./data/last_assigned_realtor.json")
+_ROUND_ROBIN_PERSIST_DELAY = 5.0
+_round_robin_index: Optional[int] = None
+_round_robin_persist_task: Optional[asyncio.Task] = None
+
+
+def _read_round_robin_index() -> int:
+    try:
+        return int(json.loads(_ROUND_ROBIN_TRACKER_PATH.read_text()).get("index", 0))
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _write_round_robin_index(index: int) -> None:
+    _ROUND_ROBIN_TRACKER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    _ROUND_ROBIN_TRACKER_PATH.write_text(json.dumps({"index": index}))
+
+
+async def _persist_round_robin_index() -> None:
+    global _round_robin_persist_task
+    try:
+        await asyncio.sleep(_ROUND_ROBIN_PERSIST_DELAY)
+        await asyncio.to_thread(_write_round_robin_index, _round_robin_index)
+    except OSError:
+        pass  # Non-critical, continue anyway
+    finally:
+        _round_robin_persist_task = None
+
+
+async def _next_round_robin_index(count: int) -> int:
+    """Advance the round-robin position over `count` realtors and return it."""
+    global _round_robin_index, _round_robin_persist_task
+
+    if _round_robin_index is None:
+        loaded = await asyncio.to_thread(_read_round_robin_index)
+        if _round_robin_index is None:
+            _round_robin_index = loaded
+
+    _round_robin_index = (_round_robin_index + 1) % count
+
+    if _round_robin_persist_task is None:
+        _round_robin_persist_task = asyncio.create_task(_persist_round_robin_index())
+
+    return _round_robin_index
 
 
 async def _get_default_realtor() -> Optional[Any]:
@@ -79,8 +248,7 @@ async def _get_default_realtor() -> Optional[Any]:
 
     Cycles through active realtors to distribute clients evenly.
     """
-    repo = Container.get_repository()
-    realtors = await repo.get_all_realtors()
+    realtors = await get_all_realtors_cached()
     active_realtors = [r for r in realtors if r.is_active]
 
     if not active_realtors:
@@ -89,29 +257,8 @@ async def _get_default_realtor() -> Optional[Any]:
     if len(active_realtors) == 1:
         return active_realtors[0]
 
-    # Load last assigned index from a simple file-based tracker
-    import json
-    import os
-    tracker_path = Path("./data/last_assigned_realtor.json")
-
-    last_index = 0
-    if tracker_path.exists():
-        try:
-            with open(tracker_path, 'r') as f:
-                data = json.load(f)
-                last_index = data.get('index', 0)
-        except (json.JSONDecodeError, IOError):
-            last_index = 0
-
-    # Calculate next index (round-robin)
-    next_index = (last_index + 1) % len(active_realtors)
-
-    # Save the new index
-    try:
-        with open(tracker_path, 'w') as f:
-            json.dump({'index': next_index}, f)
-    except IOError:
-        pass  # Non-critical, continue anyway
+    # Advance the round-robin position (kept for when round-robin is re-enabled)
+    await _next_round_robin_index(len(active_realtors))
 
     # NOTE: Round-robin disabled - Eleonora (440261312) is default
     for realtor in active_realtors:
@@ -149,46 +296,30 @@ def _set_question_step_index(user_data: dict, index: int) -> None:
     user_data["questionnaire_mode"] = True
 
 
-def _get_current_question(user_data: dict) -> Optional[tuple[str, str]]:
-    idx = _question_step_index(user_data)
-    if 0 <= idx < len(_QUESTIONNAIRE):
-        return _QUESTIONNAIRE[idx]
-    return None
+def _question_field(idx: int) -> Optional[str]:
+    """Field filled by questionnaire step `idx`, or None past the last step."""
+    return _QUESTION_FIELDS[idx] if 0 <= idx < _QUESTION_COUNT else None
 
 
-async def _ask_current_question(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    q = _get_current_question(context.user_data)
-    if not q:
-        return
-    _, text = q
-    if update.effective_message:
-        await update.effective_message.reply_text(text)
+async def _ask_question(update: Update, idx: int) -> None:
+    if 0 <= idx < _QUESTION_COUNT and update.effective_message:
+        await update.effective_message.reply_text(_QUESTION_TEXTS[idx])
 
 
 async def _autosave_client_draft(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Autosave client draft to database after each answer."""
-    repo = Container.get_repository()
-    info: Dict[str, Any] = context.user_data.get("client_info", {})
+    repo = _repo()
+    info: Optional[ClientInfoDraft] = context.user_data.get("client_info")
     
-    if not info.get("telegram_id"):
+    if not info or not info.telegram_id:
         return
     
     # Check if draft already exists
     existing_id = context.user_data.get("draft_client_id")
     
     client = ClientModel(
+        **{**asdict(info), "name": info.name or "— (в процессе)"},
         id=existing_id,
-        telegram_id=int(info["telegram_id"]),
-        realtor_id=int(info.get("realtor_id", 0)),
-        telegram_username=info.get("telegram_username"),
-        name=info.get("name", "— (в процессе)"),
-        budget=info.get("budget", ""),
-        size=info.get("size", ""),
-        location=info.get("location", ""),
-        rooms=info.get("rooms", ""),
-        ready_status=info.get("ready_status", ""),
-        contact=info.get("contact", ""),
-        notes=info.get("notes", ""),
         status="draft",  # Temporary status
     )
     
@@ -201,86 +332,160 @@ async def _autosave_client_draft(update: Update, context: ContextTypes.DEFAULT_T
             logger.info(f"Created client draft ID: {client.id}")
     except Exception as e:
         logger.error(f"Failed to autosave draft: {e}")
+    else:
+        invalidate_realtor_clients(info.realtor_id)
+
+
+# Draft autosave is debounced: answers sent in quick succession result in a
+# single write. The waiting task is kept in `_autosave_tasks` by user id;
+# saves themselves are serialized per user by `_autosave_locks` so a draft is
+# created only once. Kept out of user_data, which must stay picklable for
+# PTB persistence.
+_AUTOSAVE_DELAY = 1.5
+_autosave_tasks: Dict[int, asyncio.Task] = {}
+# Weak: a lock disappears once no save is holding or waiting for it
+_autosave_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _autosave_lock(user_id: int) -> asyncio.Lock:
+    lock = _autosave_locks.get(user_id)
+    if lock is None:
+        lock = _autosave_locks[user_id] = asyncio.Lock()
+    return lock
+
+
+async def _delayed_autosave(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> None:
+    await asyncio.sleep(_AUTOSAVE_DELAY)
+    # From here on the save is no longer cancelled by newer answers.
+    _autosave_tasks.pop(user_id, None)
+    async with _autosave_lock(user_id):
+        await _autosave_client_draft(update, context)
+
+
+def _schedule_autosave(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Save the client draft after a short delay, replacing any pending save."""
+    if not update.effective_user:
+        return
+    user_id = update.effective_user.id
+
+    pending = _autosave_tasks.get(user_id)
+    if pending:
+        pending.cancel()
+    _autosave_tasks[user_id] = asyncio.create_task(_delayed_autosave(update, context, user_id))
+
+
+async def _flush_autosave(update: Update) -> None:
+    """Drop a pending autosave and wait for one that is already running."""
+    if not update.effective_user:
+        return
+    user_id = update.effective_user.id
+
+    pending = _autosave_tasks.pop(user_id, None)
+    if pending:
+        pending.cancel()
+    async with _autosave_lock(user_id):
+        pass
+
+
+# "No additional wishes" answers to the notes question.
+_NEGATIVE_ANSWERS = frozenset({"нет", "no", "-"})
+_NEGATIVE_MAX_LEN = max(map(len, _NEGATIVE_ANSWERS))
 
 
 async def _handle_questionnaire_answer(update: Update, context: ContextTypes.DEFAULT_TYPE, answer: str) -> int:
     """Handle structured questionnaire answer; complete when finished."""
 
-    q = _get_current_question(context.user_data)
-    if not q:
+    idx = _question_step_index(context.user_data)
+    field = _question_field(idx)
+    if not field:
         return await _complete_client_conversation(update, context)
 
-    field, _ = q
-
     value = sanitize_user_text(answer, max_len=500)
-    if field == "notes" and value.lower() in {"нет", "no", "-"}:
+    if field == "notes" and len(value) <= _NEGATIVE_MAX_LEN and value.lower() in _NEGATIVE_ANSWERS:
         value = ""
 
-    context.user_data.setdefault("client_info", {})[field] = value
+    setattr(context.user_data["client_info"], field, value)
     
-    # AUTOSAVE: Save draft after each answer
-    await _autosave_client_draft(update, context)
+    # AUTOSAVE: Save draft after each answer (debounced)
+    _schedule_autosave(update, context)
 
     # Next question
-    _set_question_step_index(context.user_data, _question_step_index(context.user_data) + 1)
+    idx += 1
+    _set_question_step_index(context.user_data, idx)
 
-    if _get_current_question(context.user_data) is None:
+    if idx >= _QUESTION_COUNT:
         return await _complete_client_conversation(update, context)
 
-    await _ask_current_question(update, context)
+    await _ask_question(update, idx)
     return 8
 
 
+# Realtor notification templates, bound once at import so each notification
+# only fills in the client-specific slots.
+_NOTIFICATION_TEMPLATE = (
+    "🆕 <b>Новый клиент!</b>\n\n"
+    "👤 <b>{name}</b>\n"
+    "📞 {contact}\n"
+    "💰 Бюджет: {budget}\n"
+    "🛏 {rooms} | 📐 {size}\n"
+    "📍 {location}\n"
+    "🏗 {ready_status}\n"
+).format
+_SELECTED_APARTMENT_TEMPLATE = "\n\n⭐ <b>ВЫБРАЛ ВАРИАНТ:</b>\n{developer} — кв. {apartment_id}\n".format
+_NOTES_PREVIEW_LEN = 200
+_BTN_OPEN_CLIENT = "👤 Открыть карточку"
+_BTN_WRITE_TELEGRAM = "💬 Написать в Telegram"
+
+
 async def _notify_realtor_about_new_client(
     context: ContextTypes.DEFAULT_TYPE,
     client: ClientModel,
+    realtor: Optional[Any],
     selected_apartment: dict = None,
 ) -> None:
-    repo = Container.get_repository()
-    realtor = await repo.get_realtor(client.realtor_id)
     if not realtor:
         return
 
-    notif_msg = (
-        "🆕 <b>Новый клиент!</b>\n\n"
-        f"👤 <b>{client.name or '—'}</b>\n"
-        f"📞 {client.contact or 'Телефон не указан'}\n"
-        f"💰 Бюджет: {client.budget or '—'}\n"
-        f"🛏 {client.rooms or '—'} | 📐 {client.size or '—'}\n"
-        f"📍 {client.location or '—'}\n"
-        f"🏗 {client.ready_status or '—'}\n"
-    )
-    if client.notes:
-        notes = client.notes
-        notif_msg += f"\n📝 {notes[:200]}..." if len(notes) > 200 else f"\n📝 {notes}"
+    parts = [_NOTIFICATION_TEMPLATE(
+        name=client.name or "—",
+        contact=client.contact or "Телефон не указан",
+        budget=client.budget or "—",
+        rooms=client.rooms or "—",
+        size=client.size or "—",
+        location=client.location or "—",
+        ready_status=client.ready_status or "—",
+    )]
+    notes = client.notes
+    if notes:
+        parts.append("\n📝 ")
+        parts.append(notes if len(notes) <= _NOTES_PREVIEW_LEN else notes[:_NOTES_PREVIEW_LEN] + "...")
 
     # Add selected apartment info (highlighted!)
     if selected_apartment:
-        notif_msg += (
-            f"\n\n⭐ <b>ВЫБРАЛ ВАРИАНТ:</b>\n"
-            f"{selected_apartment.get('developer')} — кв. {selected_apartment.get('apartment_id')}\n"
-        )
-
-    keyboard = [[InlineKeyboardButton("👤 Открыть карточку", callback_data=f"client:{client.id}")]]
+        parts.append(_SELECTED_APARTMENT_TEMPLATE(
+            developer=selected_apartment.get("developer"),
+            apartment_id=selected_apartment.get("apartment_id"),
+        ))
 
+    open_row = (InlineKeyboardButton(_BTN_OPEN_CLIENT, callback_data=f"client:{client.id}"),)
     if client.telegram_username:
-        keyboard.append([
-            InlineKeyboardButton(
-                "💬 Написать в Telegram",
-                url=f"https://t.me/{client.telegram_username}",
-            )
-        ])
+        keyboard = (
+            open_row,
+            (InlineKeyboardButton(_BTN_WRITE_TELEGRAM, url=f"https://t.me/{client.telegram_username}"),),
+        )
+    else:
+        keyboard = (open_row,)
 
     await context.bot.send_message(
         chat_id=realtor.id,
-        text=notif_msg,
+        text="".join(parts),
         reply_markup=InlineKeyboardMarkup(keyboard),
         parse_mode="HTML",
     )
 
 
 async def _search_and_format_apartments(
-    client_info: Dict[str, Any],
+    client_info: ClientInfoDraft,
     max_results: int = 5,
     offset: int = 0
 ) -> tuple[Optional[str], list]:
@@ -306,11 +511,11 @@ async def _search_and_format_apartments(
         # Search for matches
         matches = await asyncio.to_thread(
             inventory_matcher.match_apartments,
-            budget=client_info.get("budget"),
-            size=client_info.get("size"),
-            location=client_info.get("location"),
-            rooms=client_info.get("rooms"),
-            ready_status=client_info.get("ready_status"),
+            budget=client_info.budget,
+            size=client_info.size,
+            location=client_info.location,
+            rooms=client_info.rooms,
+            ready_status=client_info.ready_status,
             max_results=max_results,
             offset=offset
         )
@@ -335,43 +540,49 @@ async def _complete_client_conversation(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
 ) -> int:
-    repo = Container.get_repository()
+    repo = _repo()
 
-    info: Dict[str, Any] = context.user_data.get("client_info", {})
-    realtor_id = info.get("realtor_id")
+    info: ClientInfoDraft = context.user_data["client_info"]
+    realtor_id = info.realtor_id
     
+    # The final save below supersedes a pending draft autosave
+    await _flush_autosave(update)
+
     # Get draft ID if exists
     draft_id = context.user_data.get("draft_client_id")
 
-    realtor = await repo.get_realtor(realtor_id) if realtor_id else None
+    # The inventory search only needs the collected criteria, so it runs
+    # while the client is saved.
+    search_task = asyncio.create_task(_search_and_format_apartments(info))
 
-    client = ClientModel(
-        id=draft_id,  # Use existing draft ID if available
-        telegram_id=int(info["telegram_id"]),
-        realtor_id=int(realtor_id),
-        telegram_username=info.get("telegram_username"),
-        name=info.get("name", ""),
-        budget=info.get("budget", ""),
-        size=info.get("size", ""),
-        location=info.get("location", ""),
-        rooms=info.get("rooms", ""),
-        ready_status=info.get("ready_status", ""),
-        contact=info.get("contact", ""),
-        notes=info.get("notes", ""),
-        status="new",  # Final status
-    )
+    try:
+        realtor = await get_realtor_cached(realtor_id) if realtor_id else None
 
-    if draft_id:
-        client = await repo.update_client(client)
-        logger.info(f"Finalized client from draft ID: {draft_id}")
-    else:
-        client = await repo.create_client(client)
+        fields = asdict(info)
+        client = ClientModel(
+            **fields,
+            id=draft_id,  # Use existing draft ID if available
+            status="new",  # Final status
+        )
+
+        # A draft only needs its fields and status updated in place; the
+        # validated (sanitized) values are stored, not the raw draft
+        if draft_id and await repo.update_client_fields(
+            draft_id, **client.model_dump(include=set(fields) | {"status"})
+        ):
+            logger.info(f"Finalized client from draft ID: {draft_id}")
+        else:
+            client = await repo.create_client(client)
+        invalidate_realtor_clients(realtor_id)
+    except BaseException:
+        search_task.cancel()
+        raise
 
     summary = client.to_summary()
     completion_msg = MessageTemplates.format_client_completion(summary=summary)
 
     # Search for matching apartments
-    apartments_msg, matches = await _search_and_format_apartments(info)
+    apartments_msg, matches = await search_task
     if apartments_msg:
         completion_msg += apartments_msg
         # Wait for client to select apartment - don't ask for contact yet
@@ -383,14 +594,20 @@ async def _complete_client_conversation(
     else:
         completion_msg += "\n\n🔍 Сейчас проверю наличие подходящих вариантов и пришлю результаты."
 
-    if update.effective_message:
-        await update.effective_message.reply_text(completion_msg, parse_mode="HTML")
+    # Notify realtor now: the client may never pick an option. A chosen
+    # apartment is sent as a follow-up by `_handle_contact_followup()`.
+    notify_task = asyncio.create_task(_notify_realtor_about_new_client(context, client, realtor))
 
-    # Notify realtor
     try:
-        await _notify_realtor_about_new_client(context, client, matches)
-    except Exception as e:
-        logger.error("Failed to notify realtor: %s", e, exc_info=True)
+        if update.effective_message:
+            await update.effective_message.reply_text(completion_msg, parse_mode="HTML")
+    finally:
+        try:
+            await notify_task
+        except Exception as e:
+            logger.error("Failed to notify realtor: %s", e, exc_info=True)
+        else:
+            context.user_data["realtor_notified"] = True
 
     # Keep conversation open for contact request, but mark client as created
     context.user_data["client_created"] = True
@@ -399,6 +616,15 @@ async def _complete_client_conversation(
     return 8  # Keep conversation open for follow-up contact
 
 
+# Replies to the list of apartment options (matched against lowercased text).
+# "Nothing fits" is checked on whole words, so "не" covers "не подошло" and
+# "не нравится" without matching inside words like "немного".
+_MORE_OPTIONS_RE = re.compile(r"ещё|еще|следующие|дальше|больше")
+_NOTHING_FITS_WORDS = frozenset({"не", "нет", "ничего", "другое", "другой"})
+_WORD_RE = re.compile(r"\w+")
+_OPTION_NUMBER_RE = re.compile(r"\b(\d+)\b")
+
+
 async def _handle_apartment_selection(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -409,14 +635,14 @@ async def _handle_apartment_selection(
     sanitized = sanitize_user_text(text, max_len=500).lower()
 
     # Check if client wants more options
-    if any(word in sanitized for word in ['ещё', 'еще', 'следующие', 'дальше', 'больше']):
+    if _MORE_OPTIONS_RE.search(sanitized):
         await update.effective_message.reply_text("🔍 Ищу ещё варианты...")
         
         # Get current offset and show next batch
         current_offset = context.user_data.get("search_offset", 0)
         new_offset = current_offset + 5
         
-        client_info = context.user_data.get("client_info", {})
+        client_info = context.user_data["client_info"]
         apartments_msg, matches = await _search_and_format_apartments(
             client_info, max_results=5, offset=new_offset
         )
@@ -439,8 +665,7 @@ async def _handle_apartment_selection(
             return 8
 
     # Check if client said nothing fits
-    negative_responses = ['не', 'ничего', 'не подошло', 'не нравится', 'другое', 'другой', 'нет']
-    if any(neg in sanitized for neg in negative_responses) or 'подошло' in sanitized:
+    if not _NOTHING_FITS_WORDS.isdisjoint(_WORD_RE.findall(sanitized)):
         await update.effective_message.reply_text(
             "Поняла! Давайте уточним критерии — что именно не устроило?"
         )
@@ -449,18 +674,16 @@ async def _handle_apartment_selection(
         # Block auto-search until client provides new criteria
         context.user_data["awaiting_criteria_update"] = True
         # Clear invalid budget to force re-entry
-        client_info = context.user_data.get("client_info", {})
-        if client_info.get("budget") and not any(c.isdigit() for c in str(client_info.get("budget", ""))):
-            client_info["budget"] = None
-            context.user_data["client_info"] = client_info
+        client_info = context.user_data["client_info"]
+        if client_info.budget and not any(c.isdigit() for c in client_info.budget):
+            client_info.budget = ""
         return 8
 
     # Try to extract apartment number (1, 2, 3, etc.)
-    import re
-    numbers = re.findall(r'\b(\d+)\b', sanitized)
+    number = _OPTION_NUMBER_RE.search(sanitized)
 
-    if numbers:
-        apt_num = int(numbers[0])
+    if number:
+        apt_num = int(number.group(1))
         matches = context.user_data.get("shown_apartments", [])
 
         if 1 <= apt_num <= len(matches):
@@ -511,11 +734,12 @@ async def _handle_contact_followup(
     sanitized = sanitize_user_text(text, max_len=200)
 
     # Update client with contact info
-    repo = Container.get_repository()
+    repo = _repo()
     client = await repo.get_client(client_id)
     if client:
         client.contact = sanitized
         await repo.update_client(client)
+        invalidate_realtor_clients(client.realtor_id)
 
         # Smooth transition to direct communication - no "I passed info" message
         selected = context.user_data.get("selected_apartment", {})
@@ -530,16 +754,60 @@ async def _handle_contact_followup(
                 f"✅ Отлично! Передаю контакт Софе — она свяжется с вами {sanitized}! 📞"
             )
 
-        # Notify realtor with selected apartment info
-        try:
-            await _notify_realtor_about_new_client(context, client, selected)
-        except Exception as e:
-            logger.error("Failed to notify realtor about contact update: %s", e)
+        # Notify realtor with selected apartment info; without a selection
+        # only if the completion notification didn't get through
+        if selected or not context.user_data.get("realtor_notified"):
+            try:
+                realtor = await get_realtor_cached(client.realtor_id)
+                await _notify_realtor_about_new_client(context, client, realtor, selected)
+            except Exception as e:
+                logger.error("Failed to notify realtor about contact update: %s", e)
 
     context.user_data.clear()
     return ConversationHandler.END
 
 
+_FALLBACK_REPLY = "Понял! Расскажите ещё немного о ваших пожеланиях?"
+_STREAM_PLACEHOLDER = "…"
+# Telegram allows roughly one message edit per second per chat
+_STREAM_EDIT_INTERVAL = 1.0
+
+
+async def _edit_streamed_message(sent: Message, text: str) -> None:
+    try:
+        await sent.edit_text(text)
+    except TelegramError as e:
+        logger.warning("Failed to edit streamed reply: %s", e)
+
+
+async def _stream_reply(message: Message, chunks: AsyncIterator[str]) -> str:
+    """Send a placeholder and edit it as LLM chunks arrive; returns the final text."""
+    sent = await message.reply_text(_STREAM_PLACEHOLDER)
+
+    parts: list[str] = []
+    shown = _STREAM_PLACEHOLDER
+    last_edit = time.monotonic()
+    async for chunk in chunks:
+        parts.append(chunk)
+        now = time.monotonic()
+        if now - last_edit >= _STREAM_EDIT_INTERVAL:
+            text = "".join(parts)
+            if text.strip() and text != shown:
+                await _edit_streamed_message(sent, text)
+                shown = text
+            last_edit = now
+
+    text = "".join(parts).strip() or _FALLBACK_REPLY
+    if text != shown:
+        await _edit_streamed_message(sent, text)
+    return text
+
+
+# A message with at most this many words besides the values the regexes
+# recognised ("мой номер", "бюджет до") carries nothing else for the LLM.
+_MAX_UNRECOGNISED_WORDS = 3
+
+
 async def _process_client_text(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -555,7 +823,7 @@ async def _process_client_text(
     if context.user_data.get("awaiting_contact"):
         return await _handle_contact_followup(update, context, text)
 
-    llm = Container.get_llm_service()
+    llm = _llm()
 
     sanitized = sanitize_user_text(text, max_len=2000)
 
@@ -563,59 +831,104 @@ async def _process_client_text(
     if context.user_data.get("questionnaire_mode") or not getattr(llm, "providers", {}):
         if not context.user_data.get("questionnaire_mode"):
             _set_question_step_index(context.user_data, 0)
-            await _ask_current_question(update, context)
+            await _ask_question(update, 0)
             return 8
         return await _handle_questionnaire_answer(update, context, sanitized)
 
-    if "conversation" not in context.user_data:
-        context.user_data["conversation"] = []
-
-    context.user_data["conversation"].append({"role": "user", "content": sanitized})
+    conversation = context.user_data.setdefault("conversation", [])
+    conversation.append({"role": "user", "content": sanitized})
+    _trim_conversation(conversation)
 
-    # Extract info once
-    info = await llm.extract_client_info(context.user_data["conversation"])
+    client_info: ClientInfoDraft = context.user_data["client_info"]
 
-    client_info: Dict[str, Any] = context.user_data.get("client_info", {})
+    # Cheap regex pass first. The LLM extraction is skipped only when this
+    # message completes the required fields with precise patterns (phone,
+    # budget, size, rooms) and says nothing else the LLM would need to read.
+    found = regex_extract(sanitized)
+    new_fields = {field for field in found if not getattr(client_info, field)}
+    client_info.fill_missing(found)
 
-    for field in [
-        "budget",
-        "size",
-        "location",
-        "rooms",
-        "ready_status",
-        "contact",
-        "notes",
-    ]:
-        if info.get(field) and not client_info.get(field):
-            client_info[field] = sanitize_user_text(str(info[field]), max_len=500)
+    response_task: Optional[asyncio.Task] = None
 
-    context.user_data["client_info"] = client_info
+    if (
+        new_fields
+        and new_fields <= CONFIDENT_FIELDS
+        and client_info.has_required_fields()
+        and unrecognised_word_count(sanitized, found) <= _MAX_UNRECOGNISED_WORDS
+    ):
+        info: Dict[str, Any] = {"is_complete": True}
+    else:
+        # Both LLM calls only depend on the conversation so far: generate the
+        # reply speculatively while extracting, and drop it if we complete.
+        # A streamed reply is visible as it is generated, so it can't be
+        # speculative and is only started once the dialog continues.
+        if not llm.stream:
+            response_task = asyncio.create_task(
+                llm.generate_response(_with_client_memory(conversation, client_info))
+            )
+        try:
+            info = await llm.extract_client_info(_with_client_memory(conversation, client_info))
+        except BaseException:
+            if response_task is not None:
+                response_task.cancel()
+            raise
+
+    client_info.fill_missing({
+        field: sanitize_user_text(str(value), max_len=500)
+        for field in _EXTRACTABLE_FIELDS
+        if (value := info.get(field)) and not getattr(client_info, field)
+    })
     
     # If we got a valid budget (with numbers), clear the criteria update block
-    budget = client_info.get("budget", "")
-    if budget and any(c.isdigit() for c in str(budget)):
+    budget = client_info.budget
+    if budget and any(c.isdigit() for c in budget):
         context.user_data.pop("awaiting_criteria_update", None)
     
-    # AUTOSAVE: Save draft after each LLM extraction
-    await _autosave_client_draft(update, context)
+    # AUTOSAVE: Save draft after each LLM extraction (debounced)
+    _schedule_autosave(update, context)
 
     # Complete (only if not awaiting criteria update)
     if info.get("is_complete") and not context.user_data.get("awaiting_criteria_update"):
+        if response_task is not None:
+            response_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await response_task
         return await _complete_client_conversation(update, context)
 
     # Continue dialog
-    response = await llm.generate_response(context.user_data["conversation"])
-    if not response:
-        response = "Понял! Расскажите ещё немного о ваших пожеланиях?"
+    if llm.stream and response_task is None and update.effective_message:
+        response = await _stream_reply(
+            update.effective_message,
+            llm.generate_response_stream(_with_client_memory(conversation, client_info)),
+        )
+    else:
+        if response_task is not None:
+            response = await response_task
+        else:
+            response = await llm.generate_response(_with_client_memory(conversation, client_info))
+        if not response:
+            response = _FALLBACK_REPLY
 
-    if update.effective_message:
-        await update.effective_message.reply_text(response)
+        if update.effective_message:
+            await update.effective_message.reply_text(response)
 
-    context.user_data["conversation"].append({"role": "assistant", "content": response})
+    conversation.append({"role": "assistant", "content": response})
 
     return 8  # keep state value compatibility (ConversationState.CLIENT_COMPLETE.value)
 
 
+_REALTOR_WELCOME_TEXT = (
+    "👋 С возвращением!\n\n"
+    "Команды:\n"
+    "/clients - список ваших клиентов\n"
+    "/stats - статистика\n"
+    "/help - помощь"
+)
+_RETURNING_CLIENT_WELCOME_TEXT = "👋 С возвращением! Продолжим подбор?"
+_NEW_CLIENT_WELCOME_TEXT = "Здравствуйте! Я ассистент риелтора в Батуми. Какой бюджет рассматриваете?"
+_REALTOR_PREFIX_TEMPLATE = "Риелтор: {name}".format
+
+
 @with_middleware
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Handle /start command and route based on user type."""
@@ -624,24 +937,22 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     if not user or not update.effective_message:
         return ConversationHandler.END
 
-    if await _is_realtor(user.id):
-        await update.effective_message.reply_text(
-            "👋 С возвращением!\n\n"
-            "Команды:\n"
-            "/clients - список ваших клиентов\n"
-            "/stats - статистика\n"
-            "/help - помощь"
-        )
+    # Independent lookups run concurrently: the user's own records (realtor
+    # record, existing client and that client's realtor in one query) and
+    # the referral realtor.
+    repo = _repo()
+    referral_realtor_id = _parse_referral_code(context)
+    lookups = [repo.resolve_start_context(user.id)]
+    if referral_realtor_id:
+        lookups.append(_get_realtor_by_id(referral_realtor_id))
+    (own_realtor, existing_client, existing_realtor), *referral = await asyncio.gather(*lookups)
+
+    if own_realtor:
+        await update.effective_message.reply_text(_REALTOR_WELCOME_TEXT)
         return ConversationHandler.END
 
     # Get target realtor from referral code or default
-    referral_realtor_id = _parse_referral_code(context)
-    if referral_realtor_id:
-        target_realtor = await _get_realtor_by_id(referral_realtor_id)
-        if not target_realtor:
-            target_realtor = await _get_default_realtor()
-    else:
-        target_realtor = await _get_default_realtor()
+    target_realtor = referral[0] if referral and referral[0] else await _get_default_realtor()
     
     if not target_realtor:
         await update.effective_message.reply_text(
@@ -650,16 +961,10 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         )
         return ConversationHandler.END
 
-    # Check if client already exists with ANY realtor
-    repo = Container.get_repository()
-    existing_client = await repo.get_client_by_telegram_global(user.id)
-    
     logger.info(f"[DEBUG] User {user.id} (@{user.username}): existing_client={existing_client is not None}, target_realtor={target_realtor.full_name if target_realtor else None}")
     
     if existing_client:
         # Client exists with another realtor
-        existing_realtor = await repo.get_realtor(existing_client.realtor_id)
-        
         logger.info(f"[DEBUG] existing_realtor={existing_realtor.full_name if existing_realtor else None} (id={existing_client.realtor_id}), target={target_realtor.full_name if target_realtor else None} (id={target_realtor.id if target_realtor else None})")
         
         if existing_realtor and existing_realtor.id != target_realtor.id:
@@ -712,63 +1017,25 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     # Setup client info with chosen realtor
     if is_returning and existing_client:
         # Restore from database - client already exists
-        context.user_data["client_info"] = {
-            "telegram_id": existing_client.telegram_id,
-            "telegram_username": existing_client.telegram_username,
-            "name": existing_client.name,
-            "realtor_id": existing_client.realtor_id,
-            "budget": existing_client.budget,
-            "size": existing_client.size,
-            "location": existing_client.location,
-            "rooms": existing_client.rooms,
-            "ready_status": existing_client.ready_status,
-            "notes": existing_client.notes,
-            "contact": existing_client.contact,
-        }
-        # Reconstruct conversation history from saved data
-        context.user_data["conversation"] = [
-            {"role": "system", "content": f"Риелтор: {target_realtor.full_name}"}
-        ]
-        # Add what we know about the client
-        client_summary = []
-        if existing_client.budget:
-            client_summary.append(f"Бюджет: {existing_client.budget}")
-        if existing_client.size:
-            client_summary.append(f"Площадь: {existing_client.size}")
-        if existing_client.location:
-            client_summary.append(f"Район: {existing_client.location}")
-        if existing_client.rooms:
-            client_summary.append(f"Комнаты: {existing_client.rooms}")
-        if existing_client.ready_status:
-            client_summary.append(f"Стадия: {existing_client.ready_status}")
-        if existing_client.notes:
-            client_summary.append(f"Пожелания: {existing_client.notes}")
-        
-        if client_summary:
-            context.user_data["conversation"].append({
-                "role": "user", 
-                "content": f"Я ищу квартиру. {', '.join(client_summary)}"
-            })
+        context.user_data["client_info"] = ClientInfoDraft.from_client(existing_client)
+        # Known criteria reach the LLM via `_client_memory_message()`, so the
+        # history itself only needs the static prefix seeded below.
     else:
-        context.user_data["client_info"] = {
-            "telegram_id": user.id,
-            "telegram_username": user.username,
-            "name": user.full_name,
-            "realtor_id": target_realtor.id,
-        }
+        context.user_data["client_info"] = ClientInfoDraft(
+            telegram_id=user.id,
+            realtor_id=target_realtor.id,
+            telegram_username=user.username,
+            name=user.full_name,
+        )
     
-    context.user_data["conversation"] = []
-
     # Send welcome message using template with realtor's name
-    if is_returning:
-        welcome_text = f"👋 С возвращением! Продолжим подбор?"
-    else:
-        welcome_text = f"Здравствуйте! Я ассистент риелтора в Батуми. Какой бюджет рассматриваете?"
+    welcome_text = _RETURNING_CLIENT_WELCOME_TEXT if is_returning else _NEW_CLIENT_WELCOME_TEXT
     await update.effective_message.reply_text(welcome_text)
     
-    # Initialize conversation history for LLM
+    # Initialize conversation history for LLM. Index 0 is the static prefix and
+    # is never mutated, so provider prompt caching keeps hitting across turns.
     context.user_data["conversation"] = [
-        {"role": "system", "content": f"Риелтор: {target_realtor.full_name}"},
+        {"role": "system", "content": _REALTOR_PREFIX_TEMPLATE(name=target_realtor.full_name)},
         {"role": "assistant", "content": welcome_text}
     ]
 
@@ -782,13 +1049,18 @@ async def handle_client_llm_message(update: Update, context: ContextTypes.DEFAUL
     if not update.effective_message or not update.effective_message.text:
         return 8
 
+    # Whitespace-only messages don't need an LLM round-trip or a draft save
+    text = update.effective_message.text.strip()
+    if not text:
+        return 8
+
     if "client_info" not in context.user_data:
         await update.effective_message.reply_text(
             "Сначала отправьте /start чтобы начать диалог."
         )
         return ConversationHandler.END
 
-    return await _process_client_text(update, context, update.effective_message.text)
+    return await _process_client_text(update, context, text)
 
 
 @with_middleware
@@ -806,7 +1078,7 @@ async def handle_client_voice(update: Update, context: ContextTypes.DEFAULT_TYPE
     if not update.message or not update.message.voice:
         return 8
 
-    llm = Container.get_llm_service()
+    llm = _llm()
 
     # If transcription is unavailable, ask user to send text.
     if not getattr(llm, "providers", {}):
@@ -817,19 +1089,10 @@ async def handle_client_voice(update: Update, context: ContextTypes.DEFAULT_TYPE
             )
         return 8
 
-    # Download voice file
+    # Download voice into memory and transcribe straight from bytes (no temp file)
     voice_file = await update.message.voice.get_file()
-    fd, voice_path = tempfile.mkstemp(suffix=".oga")
-    os.close(fd)
-
-    try:
-        await voice_file.download_to_drive(voice_path)
-        text = await llm.transcribe_audio(voice_path)
-    finally:
-        try:
-            os.remove(voice_path)
-        except Exception:
-            pass
+    audio = await voice_file.download_as_bytearray()
+    text = await llm.transcribe_audio(audio, mime="audio/ogg")
 
     if not text:
         if update.effective_message:
@@ -1,5 +1,6 @@
 """Configuration management with pydantic-settings."""
-from enum import Enum
+from enum import Enum, IntEnum
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -7,8 +8,11 @@ from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-class ConversationState(Enum):
-    """Conversation states for type-safe state management."""
+class ConversationState(IntEnum):
+    """Conversation states for type-safe state management.
+
+    IntEnum members are plain ints, as python-telegram-bot expects.
+    """
     # Client states
     CLIENT_START = 0
     CLIENT_BUDGET = 1
@@ -29,8 +33,13 @@ class ConversationState(Enum):
     REALTOR_COMPLETE = 15
 
 
-class ClientStatus(Enum):
-    """Client lead statuses."""
+class ClientStatus(str, Enum):
+    """Client lead statuses.
+
+    Members are also plain strings, so they compare and hash equal to the
+    stored values. Use `.value` in f-strings: `format()` of a str-mixin
+    member is not the bare value on every Python version.
+    """
     DRAFT = "draft"  # Temporary, during conversation
     NEW = "new"
     CONTACTED = "contacted"
@@ -39,13 +48,13 @@ class ClientStatus(Enum):
     REJECTED = "rejected"
 
 
-class LLMProvider(Enum):
+class LLMProvider(str, Enum):
     """Supported LLM providers."""
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
 
 
-class DatabaseBackend(Enum):
+class DatabaseBackend(str, Enum):
     """Supported database backends."""
     JSON = "json"
     SQLITE = "sqlite"
@@ -188,8 +197,17 @@ class Settings(BaseSettings):
         )
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the global settings instance (created and validated on first use)."""
+    return Settings()
+
+
+def __getattr__(name: str):
+    """Resolve `settings` lazily, so importing enums/templates doesn't read .env."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Message templates
@@ -235,10 +253,16 @@ class MessageTemplates:
 Я подберу для вас актуальные варианты и пришлю на рассмотрение. После этого можно обсудить детали и договориться о просмотре.
 """
     
+    # Each template has a single placeholder, split around it once so
+    # formatting is a plain concatenation.
+    _CLIENT_WELCOME_PARTS = tuple(CLIENT_WELCOME.split("{realtor_name}"))
+    _CLIENT_COMPLETION_PARTS = tuple(CLIENT_COMPLETION.split("{summary}"))
+    
     @staticmethod
     def format_client_welcome(realtor_name: str) -> str:
         """Format client welcome message."""
-        return MessageTemplates.CLIENT_WELCOME.format(realtor_name=realtor_name)
+        prefix, suffix = MessageTemplates._CLIENT_WELCOME_PARTS
+        return f"{prefix}{realtor_name}{suffix}"
     
     @staticmethod
     def format_client_completion(summary: str, realtor_phone: str | None = None) -> str:
@@ -248,15 +272,14 @@ class MessageTemplates:
             summary: Client requirements summary
             realtor_phone: Kept for backward compatibility, not shown to client
         """
-        return MessageTemplates.CLIENT_COMPLETION.format(
-            summary=summary,
-            realtor_phone=realtor_phone or ""
-        )
+        prefix, suffix = MessageTemplates._CLIENT_COMPLETION_PARTS
+        return f"{prefix}{summary}{suffix}"
 
 
 # Export commonly used objects
 __all__ = [
     "settings",
+    "get_settings",
     "Settings",
     "ConversationState",
     "ClientStatus",
@@ -14,44 +14,117 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Dict
+import re
+from functools import wraps
+from typing import Awaitable, Callable, Dict, Optional
 
-from telegram import Update
+from telegram import Message, Update, User
 from telegram.ext import ContextTypes
 
 from core.container import Container
 from core.middleware import with_middleware
+from core.realtor_cache import is_realtor
 from utils.helpers import sanitize_user_text
 
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import. The accessors still go through the Container
+# singletons, so `Container.reset()` keeps working.
+_drive = Container.get_drive_manager
+_matcher = Container.get_inventory_matcher
 
-async def _is_realtor(user_id: int) -> bool:
-    repo = Container.get_repository()
-    return (await repo.get_realtor(user_id)) is not None
+# In-flight inventory refresh, shared by concurrent /inventory and /search calls.
+_refresh_task: Optional[asyncio.Future] = None
+_refresh_forced = False
 
 
-@with_middleware
-async def drive_setup_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Authorize Google Drive via OAuth code."""
+async def _ensure_inventory(matcher, force: bool = False) -> bool:
+    """Make sure inventory is loaded, running at most one Drive refresh at a time.
 
-    user = update.effective_user
-    msg = update.effective_message
-    if not user or not msg:
-        return
+    Concurrent callers await the same refresh (a no-op while the cache TTL is
+    valid), so the matcher is never refreshed from two threads at once.
+    With `force`, a refresh already running predates the request: it is
+    waited out and a forced one is started (or joined, if another forced
+    caller started it meanwhile).
+    """
+    global _refresh_task, _refresh_forced
 
-    if not await _is_realtor(user.id):
-        await msg.reply_text("⚠️ Только для риелторов.")
-        return
+    if force and _refresh_task is not None and not _refresh_task.done():
+        await asyncio.wait({_refresh_task})
+        while _refresh_task is not None and not _refresh_task.done() and not _refresh_forced:
+            await asyncio.wait({_refresh_task})
+
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.ensure_future(asyncio.to_thread(matcher.refresh_inventory, force))
+        _refresh_forced = force
+
+    # Shielded so a cancelled caller doesn't abort the refresh for the others
+    return await asyncio.shield(_refresh_task)
+
+
+def requires_realtor(
+    func: Callable[[Update, ContextTypes.DEFAULT_TYPE, User, Message], Awaitable[None]],
+) -> Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]:
+    """Run the handler only for registered realtors, passing it the user and message."""
+
+    @wraps(func)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        user = update.effective_user
+        msg = update.effective_message
+        if not (user and msg):
+            return
+
+        if not await is_realtor(user.id):
+            await msg.reply_text("⚠️ Только для риелторов.")
+            return
+
+        await func(update, context, user, msg)
+
+    return wrapper
+
+
+# Google OAuth codes are URL-safe ASCII (e.g. "4/0AX4XfW..."); anything else
+# is rejected before the sanitizer and the OAuth round-trip.
+_OAUTH_CODE_RE = re.compile(r"[A-Za-z0-9_\-./]{10,512}")
 
-    drive = Container.get_drive_manager()
+_DRIVE_ALREADY_CONNECTED_TEXT = (
+    "✅ Google Drive уже подключен!\n\n"
+    "Используйте /inventory чтобы посмотреть остатки."
+)
+
+_SEARCH_HELP_TEXT = (
+    "🔍 Поиск по остаткам\n\n"
+    "Использование:\n"
+    "/search бюджет=150000 комнаты=2\n"
+    "/search площадь=50-70\n\n"
+    "Параметры:\n"
+    "• бюджет=XXX (в лари)\n"
+    "• комнаты=X (0=студия, 1,2,3...)\n"
+    "• площадь=XX-XX (в м²)\n"
+    "• локация=название"
+)
+
+_SEARCH_RESULTS_HINT_TEXT = (
+    "💡 Хотите посмотреть планировки понравившихся квартир? "
+    "Напишите номера квартир (например: 205, 207).\n\n"
+    "Или напишите «ещё» чтобы увидеть следующие варианты."
+)
+
+_SHOW_MORE_HINT_TEXT = "💡 Напишите номера квартир для планировок, или «ещё» для следующих вариантов."
+
+
+@with_middleware
+@requires_realtor
+async def drive_setup_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, user: User, msg: Message
+) -> None:
+    """Authorize Google Drive via OAuth code."""
+
+    drive = _drive()
 
     if drive.is_authorized():
-        await msg.reply_text(
-            "✅ Google Drive уже подключен!\n\n"
-            "Используйте /inventory чтобы посмотреть остатки."
-        )
+        await msg.reply_text(_DRIVE_ALREADY_CONNECTED_TEXT)
         return
 
     try:
@@ -87,12 +160,21 @@ async def drive_auth_code_handler(update: Update, context: ContextTypes.DEFAULT_
     if not msg or not msg.text:
         return
 
-    auth_code = sanitize_user_text(msg.text, max_len=512)
-
-    await msg.reply_text("🔄 Подключаю Google Drive...")
+    auth_code = msg.text.strip()
+    if not _OAUTH_CODE_RE.fullmatch(auth_code):
+        await msg.reply_text(
+            "❌ Неверный формат кода.\n\n"
+            "Попробуйте снова: /drive_setup"
+        )
+        context.user_data["awaiting_drive_code"] = False
+        return
 
-    drive = Container.get_drive_manager()
-    ok = await asyncio.to_thread(drive.complete_auth, auth_code)
+    drive = _drive()
+    # Status reply and auth run concurrently
+    _, ok = await asyncio.gather(
+        msg.reply_text("🔄 Подключаю Google Drive..."),
+        asyncio.to_thread(drive.complete_auth, auth_code),
+    )
 
     if ok:
         await msg.reply_text(
@@ -112,19 +194,13 @@ async def drive_auth_code_handler(update: Update, context: ContextTypes.DEFAULT_
 
 
 @with_middleware
-async def inventory_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@requires_realtor
+async def inventory_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, user: User, msg: Message
+) -> None:
     """Load and show inventory summary."""
 
-    user = update.effective_user
-    msg = update.effective_message
-    if not user or not msg:
-        return
-
-    if not await _is_realtor(user.id):
-        await msg.reply_text("⚠️ Только для риелторов.")
-        return
-
-    drive = Container.get_drive_manager()
+    drive = _drive()
     if not drive.is_authorized():
         await msg.reply_text(
             "🔐 Google Drive не подключен.\n\n"
@@ -132,10 +208,11 @@ async def inventory_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
 
-    await msg.reply_text("🔄 Загружаю остатки...")
-
-    matcher = Container.get_inventory_matcher()
-    ok = await asyncio.to_thread(matcher.refresh_inventory, False)
+    matcher = _matcher()
+    _, ok = await asyncio.gather(
+        msg.reply_text("🔄 Загружаю остатки..."),
+        _ensure_inventory(matcher),
+    )
 
     if not ok:
         await msg.reply_text(
@@ -152,64 +229,66 @@ async def inventory_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
 
-    lines = ["📦 Остатки по застройщикам:\n"]
-    for developer_name, df in inventory.items():
-        if df is not None:
-            lines.append(f"🏢 {developer_name}: {len(df)} квартир")
-
-    lines.append("\nДля поиска используйте /search")
-    await msg.reply_text("\n".join(lines))
+    await msg.reply_text("\n".join((
+        "📦 Остатки по застройщикам:\n",
+        *(
+            f"🏢 {developer_name}: {df.shape[0]} квартир"
+            for developer_name, df in inventory.items()
+            if df is not None
+        ),
+        "\nДля поиска используйте /search",
+    )))
+
+
+# /search parameter names (Russian or English) -> match_apartments() field
+_SEARCH_PARAM_ALIASES: Dict[str, str] = {
+    "бюджет": "budget",
+    "площадь": "size",
+    "локация": "location",
+    "комнаты": "rooms",
+    "стадия": "ready_status",
+    "budget": "budget",
+    "size": "size",
+    "location": "location",
+    "rooms": "rooms",
+    "ready_status": "ready_status",
+}
 
 
 @with_middleware
-async def search_inventory_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@requires_realtor
+async def search_inventory_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, user: User, msg: Message
+) -> None:
     """Search matching inventory by parameters."""
 
-    user = update.effective_user
-    msg = update.effective_message
-    if not user or not msg:
-        return
-
-    if not await _is_realtor(user.id):
-        await msg.reply_text("⚠️ Только для риелторов.")
-        return
-
     args = context.args or []
     if not args:
-        await msg.reply_text(
-            "🔍 Поиск по остаткам\n\n"
-            "Использование:\n"
-            "/search бюджет=150000 комнаты=2\n"
-            "/search площадь=50-70\n\n"
-            "Параметры:\n"
-            "• бюджет=XXX (в лари)\n"
-            "• комнаты=X (0=студия, 1,2,3...)\n"
-            "• площадь=XX-XX (в м²)\n"
-            "• локация=название"
-        )
+        await msg.reply_text(_SEARCH_HELP_TEXT)
         return
 
     params: Dict[str, str] = {}
     for arg in args:
-        if "=" in arg:
-            k, v = arg.split("=", 1)
-            params[sanitize_user_text(k.lower(), 32)] = sanitize_user_text(v, 128)
-
-    await msg.reply_text("🔍 Ищу подходящие варианты...")
+        key, sep, value = arg.partition("=")
+        field = _SEARCH_PARAM_ALIASES.get(key.lower())
+        if sep and field:
+            params[field] = sanitize_user_text(value, 128)
 
-    matcher = Container.get_inventory_matcher()
+    matcher = _matcher()
 
-    # ensure inventory loaded (in thread)
-    if not matcher.inventory_cache:
-        await asyncio.to_thread(matcher.refresh_inventory, False)
+    # ensure inventory loaded (in thread) while the status reply is sent
+    await asyncio.gather(
+        msg.reply_text("🔍 Ищу подходящие варианты..."),
+        _ensure_inventory(matcher),
+    )
 
     matches = await asyncio.to_thread(
         matcher.match_apartments,
-        params.get("бюджет") or params.get("budget"),
-        params.get("площадь") or params.get("size"),
-        params.get("локация") or params.get("location"),
-        params.get("комнаты") or params.get("rooms"),
-        params.get("стадия") or params.get("ready_status"),
+        params.get("budget"),
+        params.get("size"),
+        params.get("location"),
+        params.get("rooms"),
+        params.get("ready_status"),
         5,
     )
 
@@ -231,29 +310,19 @@ async def search_inventory_command(update: Update, context: ContextTypes.DEFAULT
     for m in matches:
         text.append(matcher.format_match(m))
     
-    text.append(
-        "💡 Хотите посмотреть планировки понравившихся квартир? "
-        "Напишите номера квартир (например: 205, 207).\n\n"
-        "Или напишите «ещё» чтобы увидеть следующие варианты."
-    )
+    text.append(_SEARCH_RESULTS_HINT_TEXT)
 
     await msg.reply_text("\n".join(text))
 
 
 @with_middleware
-async def folders_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+@requires_realtor
+async def folders_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, user: User, msg: Message
+) -> None:
     """Show configured developer folders."""
 
-    user = update.effective_user
-    msg = update.effective_message
-    if not user or not msg:
-        return
-
-    if not await _is_realtor(user.id):
-        await msg.reply_text("⚠️ Только для риелторов.")
-        return
-
-    drive = Container.get_drive_manager()
+    drive = _drive()
     folders = drive.folders
 
     if not folders:
@@ -280,7 +349,7 @@ async def search_followup_handler(update: Update, context: ContextTypes.DEFAULT_
     if not user or not msg or not msg.text:
         return
 
-    if not await _is_realtor(user.id):
+    if not await is_realtor(user.id):
         return  # Let other handlers process
 
     text = msg.text.lower().strip()
@@ -292,7 +361,6 @@ async def search_followup_handler(update: Update, context: ContextTypes.DEFAULT_
 
     # Check if user is requesting layouts (contains apartment numbers)
     # Pattern: numbers like "205", "205, 207", "апт 205", "кв 205"
-    import re
     apt_numbers = re.findall(r'(?:апт|кв|квартира)?\s*(\d+)', text)
     if apt_numbers and len(apt_numbers) <= 5:  # Reasonable number of apartments
         await _handle_layout_request(update, context, apt_numbers)
@@ -319,16 +387,18 @@ async def _handle_show_more(update: Update, context: ContextTypes.DEFAULT_TYPE)
     params = last_search["params"]
     shown = last_search["shown_count"]
 
-    matcher = Container.get_inventory_matcher()
+    matcher = _matcher()
+    # A stale cache is refreshed here, not inside match_apartments' thread
+    await _ensure_inventory(matcher)
 
     # Get more results with offset
     matches = await asyncio.to_thread(
         matcher.match_apartments,
-        params.get("бюджет") or params.get("budget"),
-        params.get("площадь") or params.get("size"),
-        params.get("локация") or params.get("location"),
-        params.get("комнаты") or params.get("rooms"),
-        params.get("стадия") or params.get("ready_status"),
+        params.get("budget"),
+        params.get("size"),
+        params.get("location"),
+        params.get("rooms"),
+        params.get("ready_status"),
         shown + 5,  # Get more to skip already shown
     )
 
@@ -347,9 +417,7 @@ async def _handle_show_more(update: Update, context: ContextTypes.DEFAULT_TYPE)
     for m in new_matches:
         text.append(matcher.format_match(m))
 
-    text.append(
-        "💡 Напишите номера квартир для планировок, или «ещё» для следующих вариантов."
-    )
+    text.append(_SHOW_MORE_HINT_TEXT)
 
     await msg.reply_text("\n".join(text))
 
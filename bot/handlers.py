@@ -6,49 +6,60 @@ The original code had a single large `handlers.py`. This refactor splits it into
 - `bot/drive_handlers.py`
 
 This module re-exports the public handler functions and state constants so that
-`main.py` can keep importing from `bot.handlers`.
+`main.py` can keep importing from `bot.handlers`. Handler modules are imported
+lazily (PEP 562), on first access to one of their names.
 """
 
 from __future__ import annotations
 
+import importlib
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from bot.client_handlers import (
-    start_command,
-    handle_client_llm_message,
-    handle_client_voice,
-    cancel_command,
-)
-from bot.realtor_handlers import (
-    register_command,
-    clients_command,
-    stats_command,
-    link_command,
-    client_detail_command,
-    export_command,
-    developers_command,
-    handle_realtor_phone,
-    handle_realtor_company,
-    button_callback,
-)
-from bot.drive_handlers import (
-    drive_setup_command,
-    drive_auth_code_handler,
-    inventory_command,
-    search_inventory_command,
-    folders_command,
-)
-
 from bot.config import ConversationState
 from core.container import Container
 from core.middleware import with_middleware
 
 
 # ===== Conversation state ints (python-telegram-bot requires ints) =====
-STATE_REALTOR_PHONE = ConversationState.REALTOR_PHONE.value
-STATE_REALTOR_COMPANY = ConversationState.REALTOR_COMPANY.value
-STATE_CLIENT_COMPLETE = ConversationState.CLIENT_COMPLETE.value
+STATE_REALTOR_PHONE = ConversationState.REALTOR_PHONE
+STATE_REALTOR_COMPANY = ConversationState.REALTOR_COMPANY
+STATE_CLIENT_COMPLETE = ConversationState.CLIENT_COMPLETE
+
+
+# Re-exported name -> module that defines it
+_LAZY_EXPORTS = {
+    "start_command": "bot.client_handlers",
+    "handle_client_llm_message": "bot.client_handlers",
+    "handle_client_voice": "bot.client_handlers",
+    "cancel_command": "bot.client_handlers",
+    "register_command": "bot.realtor_handlers",
+    "clients_command": "bot.realtor_handlers",
+    "stats_command": "bot.realtor_handlers",
+    "link_command": "bot.realtor_handlers",
+    "client_detail_command": "bot.realtor_handlers",
+    "export_command": "bot.realtor_handlers",
+    "developers_command": "bot.realtor_handlers",
+    "handle_realtor_phone": "bot.realtor_handlers",
+    "handle_realtor_company": "bot.realtor_handlers",
+    "button_callback": "bot.realtor_handlers",
+    "drive_setup_command": "bot.drive_handlers",
+    "drive_auth_code_handler": "bot.drive_handlers",
+    "inventory_command": "bot.drive_handlers",
+    "search_inventory_command": "bot.drive_handlers",
+    "folders_command": "bot.drive_handlers",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
 
 
 @with_middleware
@@ -129,6 +140,8 @@ async def auto_restart_for_existing_client(update: Update, context: ContextTypes
     
     if is_existing_client:
         # Restart dialog by calling start_command
+        from bot.client_handlers import start_command
+
         await start_command(update, context)
 
 
@@ -13,100 +13,144 @@ New code should prefer using `Container.get_llm_service()` directly.
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, List, Optional
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar, Union
 
 from core.container import Container
 
 
+T = TypeVar("T")
+
+# Bound once at import; still resolves through the Container singleton.
+_llm = Container.get_llm_service
+
+# Event loop used by the sync wrappers. It lives in a daemon thread for the
+# whole process: `asyncio.run()` per call would build and tear down a loop each
+# time and leave the service's async HTTP clients bound to a closed loop.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="llm-handler-loop",
+                daemon=True,
+            ).start()
+        return _loop
+
+
+def _run_sync(coro: Awaitable[T], async_name: str) -> T:
+    """Run `coro` on the background loop and wait for the result."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # Blocking here would stall the caller's event loop.
+        coro.close()
+        raise RuntimeError(f"Use {async_name} inside async handlers")
+
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
 async def get_llm_response_async(messages: List[Dict], model: Optional[str] = None) -> Optional[str]:
     """Async LLM response."""
-    service = Container.get_llm_service()
+    service = _llm()
     # model param kept for compatibility; service is already configured
     return await service.generate_response(messages=messages)
 
 
-def get_llm_response(messages: List[Dict], model: str = "gpt-4o-mini") -> Optional[str]:
-    """Sync wrapper for compatibility (NOT recommended in async handlers)."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
+async def stream_llm_response(
+    messages: List[Dict],
+    on_chunk: Callable[[str], Awaitable[None]],
+) -> Optional[str]:
+    """Async streaming LLM response.
+
+    `on_chunk` is awaited for every chunk as it arrives; the full text is
+    returned at the end (None if nothing was generated).
+    """
+    service = _llm()
+    parts: List[str] = []
+    async for chunk in service.generate_response_stream(messages=messages):
+        parts.append(chunk)
+        await on_chunk(chunk)
+    return "".join(parts) or None
 
-    if loop and loop.is_running():
-        # In async context user should call async variant.
-        raise RuntimeError("Use get_llm_response_async inside async handlers")
 
-    return asyncio.run(get_llm_response_async(messages=messages, model=model))
+def get_llm_response(messages: List[Dict], model: str = "gpt-4o-mini") -> Optional[str]:
+    """Sync wrapper for compatibility (NOT recommended in async handlers)."""
+    return _run_sync(
+        get_llm_response_async(messages=messages, model=model),
+        "get_llm_response_async",
+    )
 
 
 async def extract_client_info_async(conversation_history: List[Dict]) -> Dict:
     """Async extraction of client info."""
-    service = Container.get_llm_service()
+    service = _llm()
     return await service.extract_client_info(conversation_history=conversation_history)
 
 
 def extract_client_info(conversation_history: List[Dict]) -> Dict:
     """Sync wrapper for compatibility."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-
-    if loop and loop.is_running():
-        raise RuntimeError("Use extract_client_info_async inside async handlers")
-
-    return asyncio.run(extract_client_info_async(conversation_history=conversation_history))
+    return _run_sync(
+        extract_client_info_async(conversation_history=conversation_history),
+        "extract_client_info_async",
+    )
+
+
+def should_end_conversation(info_or_history: Union[Dict, List[Dict]]) -> bool:
+    """Compatibility helper.
+
+    Pass the already extracted info dict to avoid a second extraction call;
+    a conversation history is still accepted and extracted first.
+    """
+    if isinstance(info_or_history, dict):
+        info = info_or_history
+    else:
+        info = extract_client_info(info_or_history)
+    return bool(info.get("is_complete", False))
 
 
-def should_end_conversation(conversation_history: List[Dict]) -> bool:
-    """Compatibility helper."""
-    info = extract_client_info(conversation_history)
-    return bool(info.get("is_complete", False))
+# (field, line prefix) pairs for `build_summary`
+_SUMMARY_FIELDS: tuple[tuple[str, str], ...] = (
+    ("budget", "💰 Бюджет: "),
+    ("size", "📐 Площадь: "),
+    ("location", "📍 Район: "),
+    ("rooms", "🛏 Комнаты: "),
+    ("ready_status", "🏗 Стадия: "),
+    ("contact", "📞 Контакт: "),
+    ("notes", "📝 Пожелания: "),
+)
 
 
 def build_summary(info: Dict) -> str:
     """Build a human-readable summary."""
-    field_names = {
-        "budget": "💰 Бюджет",
-        "size": "📐 Площадь",
-        "location": "📍 Район",
-        "rooms": "🛏 Комнаты",
-        "ready_status": "🏗 Стадия",
-        "contact": "📞 Контакт",
-        "notes": "📝 Пожелания",
-    }
-
-    lines = []
-    for field, label in field_names.items():
-        value = info.get(field)
-        if value:
-            lines.append(f"{label}: {value}")
-
+    lines = [f"{prefix}{value}" for field, prefix in _SUMMARY_FIELDS if (value := info.get(field))]
     return "\n".join(lines) if lines else "Информация не указана"
 
 
 async def transcribe_audio_async(audio_file_path: str) -> Optional[str]:
     """Async transcription."""
-    service = Container.get_llm_service()
-    return await service.transcribe_audio(audio_path=audio_file_path)
+    service = _llm()
+    return await service.transcribe_audio(audio_file_path)
 
 
 def transcribe_audio(audio_file_path: str) -> Optional[str]:
     """Sync wrapper for compatibility."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-
-    if loop and loop.is_running():
-        raise RuntimeError("Use transcribe_audio_async inside async handlers")
-
-    return asyncio.run(transcribe_audio_async(audio_file_path))
+    return _run_sync(transcribe_audio_async(audio_file_path), "transcribe_audio_async")
 
 
 __all__ = [
     "get_llm_response",
     "get_llm_response_async",
+    "stream_llm_response",
     "extract_client_info",
     "extract_client_info_async",
     "should_end_conversation",
@@ -12,27 +12,132 @@ All handlers are async.
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import logging
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message, Update, User
 from telegram.ext import ContextTypes, ConversationHandler
 
-from bot.config import ClientStatus
+from bot import status_writer
+from bot.client_handlers import ClientInfoDraft
+from bot.config import ClientStatus, ConversationState
 from core.container import Container
+from core.dispatch import per_user_queue
 from core.middleware import with_middleware
-from database.models import RealtorModel
-from utils.helpers import sanitize_user_text
+from core.realtor_cache import (
+    get_realtor_clients_cached,
+    invalidate_realtor_cache,
+    invalidate_realtor_clients,
+    is_realtor,
+)
+from database.async_io import write_fsync
+from database.models import ClientModel, RealtorModel, normalize_phone
+from utils.helpers import escape_html, sanitize_user_text
+
+# Optional faster JSON parser for the developer mappings
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import. The accessor still goes through the Container
+# singleton, so `Container.reset()` keeps working.
+_repo = Container.get_repository
 
-async def _is_realtor(user_id: int) -> bool:
-    repo = Container.get_repository()
-    return (await repo.get_realtor(user_id)) is not None
+# Keyed by ClientStatus members, which hash equal to the stored status strings
+_STATUS_EMOJI: Dict[str, str] = {
+    ClientStatus.NEW: "🆕",
+    ClientStatus.CONTACTED: "📞",
+    ClientStatus.VIEWING: "👁",
+    ClientStatus.CLOSED: "✅",
+    ClientStatus.REJECTED: "❌",
+}
+_STATUS_NAMES: Dict[str, str] = {
+    ClientStatus.NEW: "Новый",
+    ClientStatus.CONTACTED: "Связались",
+    ClientStatus.VIEWING: "На просмотре",
+    ClientStatus.CLOSED: "Закрыт",
+    ClientStatus.REJECTED: "Отказ",
+}
+
+# Clients listed by /clients
+_CLIENTS_PAGE_SIZE = 10
+
+
+# Registration answers are short; longer input is rejected before sanitizing
+_MAX_REGISTRATION_INPUT_LEN = 512
+_INPUT_TOO_LONG_TEXT = "❌ Слишком длинный ввод. Попробуйте ещё раз."
+
+
+@dataclass(slots=True)
+class RealtorDraft:
+    """Realtor data collected during registration (`context.user_data["new_realtor"]`).
+
+    Field names match `RealtorModel`, so a draft converts with `asdict()`.
+    """
+
+    id: int
+    username: Optional[str] = None
+    full_name: Optional[str] = None
+    phone: Optional[str] = None
+    company_name: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "RealtorDraft":
+        """Start a draft from the registering Telegram user."""
+        return cls(id=user.id, username=user.username, full_name=user.full_name)
+
+
+# Writes whose result the reply doesn't depend on run in background; the set
+# keeps references so pending tasks are not garbage-collected.
+_BTN_WRITE_TELEGRAM = "💬 Написать в Telegram"
+_BTN_CALL = "📞 Позвонить"
+_BTN_CLOSE = "✅ Закрыть"
+_BTN_REJECT = "❌ Отказ"
+_CLOSE_CALLBACK_TEMPLATE = f"status:{{}}:{ClientStatus.CLOSED.value}".format
+_REJECT_CALLBACK_TEMPLATE = f"status:{{}}:{ClientStatus.REJECTED.value}".format
+
+
+# Keyed by every field the buttons use, so a changed contact or username
+# simply misses; PTB markup objects are immutable and safe to share.
+@lru_cache(maxsize=1024)
+def _client_keyboard(
+    client_id: int, contact: str, telegram_username: Optional[str]
+) -> InlineKeyboardMarkup:
+    rows = []
+
+    if telegram_username:
+        rows.append((InlineKeyboardButton(_BTN_WRITE_TELEGRAM, url=f"https://t.me/{telegram_username}"),))
+
+    # Only add call button if contact looks like a phone number
+    if contact and contact.startswith("+"):
+        rows.append((InlineKeyboardButton(_BTN_CALL, url=f"tel:{contact}"),))
+
+    rows.append((
+        InlineKeyboardButton(_BTN_CLOSE, callback_data=_CLOSE_CALLBACK_TEMPLATE(client_id)),
+        InlineKeyboardButton(_BTN_REJECT, callback_data=_REJECT_CALLBACK_TEMPLATE(client_id)),
+    ))
+    return InlineKeyboardMarkup(rows)
+
+
+def _build_client_keyboard(client: ClientModel) -> InlineKeyboardMarkup:
+    """Client card buttons: write / call when possible, then close / reject."""
+    return _client_keyboard(client.id, client.contact, client.telegram_username)
+
+
+def _html_field(value: Optional[str]) -> str:
+    """Client field for an HTML card: escaped, or a dash when empty."""
+    return escape_html(value) if value else "—"
 
 
 @with_middleware
@@ -44,23 +149,18 @@ async def register_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     if not user or not msg:
         return ConversationHandler.END
 
-    if await _is_realtor(user.id):
+    if await is_realtor(user.id):
         await msg.reply_text("✅ Вы уже зарегистрированы как риелтор!")
         return ConversationHandler.END
 
-    context.user_data["registering_realtor"] = True
-    context.user_data["new_realtor"] = {
-        "id": user.id,
-        "username": user.username,
-        "full_name": user.full_name,
-    }
+    context.user_data["new_realtor"] = RealtorDraft.from_user(user)
 
     await msg.reply_text(
         "📝 Регистрация риелтора\n\n"
         "Шаг 1/3: Введите ваш номер телефона для связи с клиентами."
     )
 
-    return 11  # ConversationState.REALTOR_PHONE.value
+    return ConversationState.REALTOR_PHONE
 
 
 @with_middleware
@@ -69,17 +169,37 @@ async def handle_realtor_phone(update: Update, context: ContextTypes.DEFAULT_TYP
 
     msg = update.effective_message
     if not msg or not msg.text:
-        return 11
+        return ConversationState.REALTOR_PHONE
+
+    if len(msg.text) > _MAX_REGISTRATION_INPUT_LEN:
+        await msg.reply_text(_INPUT_TOO_LONG_TEXT)
+        return ConversationState.REALTOR_PHONE
+
+    # RealtorModel's own phone rule, checked before anything is stored so a
+    # bad number is re-asked here instead of failing at step 3.
+    try:
+        phone = normalize_phone(msg.text)
+    except ValueError:
+        phone = None
+    if not phone:
+        await msg.reply_text(
+            "❌ Неверный формат телефона.\n\n"
+            "Введите номер в международном формате, например: +995 555 123 456"
+        )
+        return ConversationState.REALTOR_PHONE
 
-    phone = sanitize_user_text(msg.text, max_len=64)
-    context.user_data.setdefault("new_realtor", {})["phone"] = phone
+    draft: Optional[RealtorDraft] = context.user_data.get("new_realtor")
+    if draft is None and update.effective_user:
+        draft = context.user_data["new_realtor"] = RealtorDraft.from_user(update.effective_user)
+    if draft is not None:
+        draft.phone = phone
 
     await msg.reply_text(
         f"✓ Телефон: {phone}\n\n"
         "Шаг 2/3: Введите название вашей компании (или напишите 'нет')."
     )
 
-    return 12  # ConversationState.REALTOR_COMPANY.value
+    return ConversationState.REALTOR_COMPANY
 
 
 @with_middleware
@@ -91,33 +211,40 @@ async def handle_realtor_company(update: Update, context: ContextTypes.DEFAULT_T
     if not user or not msg or not msg.text:
         return ConversationHandler.END
 
+    if len(msg.text) > _MAX_REGISTRATION_INPUT_LEN:
+        await msg.reply_text(_INPUT_TOO_LONG_TEXT)
+        return ConversationState.REALTOR_COMPANY
+
     company = sanitize_user_text(msg.text, max_len=128)
     if company.lower() in {"нет", "no", "-"}:
         company = ""
 
-    realtor_data = context.user_data.get("new_realtor", {})
-    realtor_data["company_name"] = company or None
+    draft: RealtorDraft = context.user_data.get("new_realtor") or RealtorDraft.from_user(user)
+    draft.company_name = company or None
+    draft.full_name = draft.full_name or user.full_name
 
     # Validate and persist
-    repo = Container.get_repository()
+    repo = _repo()
 
     try:
-        realtor = RealtorModel(
-            id=int(realtor_data["id"]),
-            username=realtor_data.get("username"),
-            full_name=realtor_data.get("full_name") or user.full_name,
-            phone=realtor_data.get("phone"),
-            company_name=realtor_data.get("company_name"),
-        )
+        realtor = RealtorModel(**asdict(draft))
     except Exception as e:
         await msg.reply_text(f"❌ Ошибка в данных регистрации: {e}")
         return ConversationHandler.END
 
-    await repo.create_realtor(realtor)
-
-    context.user_data.pop("registering_realtor", None)
+    logger.info("Registering realtor %s", realtor.id)
     context.user_data.pop("new_realtor", None)
 
+    try:
+        await repo.create_realtor(realtor)
+    except Exception:
+        logger.exception("Failed to register realtor %s", realtor.id)
+        await msg.reply_text("❌ Не удалось сохранить регистрацию. Попробуйте ещё раз: /register")
+        return ConversationHandler.END
+
+    # Drop a cached "not a realtor" answer
+    invalidate_realtor_cache(realtor.id)
+
     welcome_msg = (
         "✅ Регистрация завершена!\n\n"
         f"👤 {realtor.full_name}\n"
@@ -133,6 +260,7 @@ async def handle_realtor_company(update: Update, context: ContextTypes.DEFAULT_T
     return ConversationHandler.END
 
 
+@per_user_queue
 @with_middleware
 async def clients_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """List clients for realtor."""
@@ -142,37 +270,34 @@ async def clients_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not user or not msg:
         return
 
-    if not await _is_realtor(user.id):
+    if not await is_realtor(user.id):
         await msg.reply_text("⚠️ Только для риелторов.")
         return
 
-    repo = Container.get_repository()
-    clients = await repo.get_clients_by_realtor(user.id)
+    # Only the shown page is fetched; the total comes from the status counts
+    repo = _repo()
+    clients, by_status = await asyncio.gather(
+        repo.get_clients_by_realtor(user.id, limit=_CLIENTS_PAGE_SIZE),
+        repo.count_clients_by_status(user.id),
+    )
+    total = sum(by_status.values())
 
     if not clients:
         await msg.reply_text("📭 Пока нет клиентов.")
         return
 
-    status_emoji = {
-        ClientStatus.NEW.value: "🆕",
-        ClientStatus.CONTACTED.value: "📞",
-        ClientStatus.VIEWING.value: "👁",
-        ClientStatus.CLOSED.value: "✅",
-        ClientStatus.REJECTED.value: "❌",
-    }
-
-    lines = [f"📋 Ваши клиенты ({len(clients)}):\n"]
-    for i, client in enumerate(clients[:10], 1):
-        status = client.status.value if hasattr(client.status, "value") else str(client.status)
-        emoji = status_emoji.get(status, "❓")
+    lines = [f"📋 Ваши клиенты ({total}):\n"]
+    for i, client in enumerate(clients, 1):
+        emoji = _STATUS_EMOJI.get(client.status, "❓")
         lines.append(f"{i}. {emoji} {client.name or '—'} - {client.budget or '—'}")
 
-    if len(clients) > 10:
-        lines.append(f"\n... и ещё {len(clients) - 10} клиентов")
+    if total > len(clients):
+        lines.append(f"\n... и ещё {total - len(clients)} клиентов")
 
     await msg.reply_text("\n".join(lines))
 
 
+@per_user_queue
 @with_middleware
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show stats for realtor."""
@@ -182,33 +307,26 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     if not user or not msg:
         return
 
-    if not await _is_realtor(user.id):
+    if not await is_realtor(user.id):
         await msg.reply_text("⚠️ Только для риелторов.")
         return
 
-    repo = Container.get_repository()
-    clients = await repo.get_clients_by_realtor(user.id)
-
-    by_status: dict[str, int] = {}
-    for c in clients:
-        key = c.status.value if hasattr(c.status, "value") else str(c.status)
-        by_status[key] = by_status.get(key, 0) + 1
-
-    total = len(clients)
+    by_status = await _repo().count_clients_by_status(user.id)
+    total = sum(by_status.values())
 
     msg_text = (
         "📊 Статистика:\n\n"
         f"Всего клиентов: {total}\n\n"
-        f"🆕 Новые: {by_status.get(ClientStatus.NEW.value, 0)}\n"
-        f"📞 Связались: {by_status.get(ClientStatus.CONTACTED.value, 0)}\n"
-        f"👁 На просмотре: {by_status.get(ClientStatus.VIEWING.value, 0)}\n"
-        f"✅ Закрыто: {by_status.get(ClientStatus.CLOSED.value, 0)}\n"
-        f"❌ Отказ: {by_status.get(ClientStatus.REJECTED.value, 0)}\n"
+        f"🆕 Новые: {by_status.get(ClientStatus.NEW, 0)}\n"
+        f"📞 Связались: {by_status.get(ClientStatus.CONTACTED, 0)}\n"
+        f"👁 На просмотре: {by_status.get(ClientStatus.VIEWING, 0)}\n"
+        f"✅ Закрыто: {by_status.get(ClientStatus.CLOSED, 0)}\n"
+        f"❌ Отказ: {by_status.get(ClientStatus.REJECTED, 0)}\n"
     )
 
-    if clients:
-        msg_text += "\n💡 Для просмотра деталей: /client <id>\n"
-        msg_text += f"Например: /client {clients[0].id}"
+    if total:
+        msg_text += "\n💡 Список клиентов: /clients\n"
+        msg_text += "Для просмотра деталей: /client <id>"
 
     await msg.reply_text(msg_text)
 
@@ -222,26 +340,19 @@ async def link_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     if not user or not msg:
         return
 
-    if not await _is_realtor(user.id):
+    if not await is_realtor(user.id):
         await msg.reply_text("⚠️ Только для риелторов.")
         return
 
-    repo = Container.get_repository()
+    repo = _repo()
     realtor = await repo.get_realtor(user.id)
     
     if not realtor:
         await msg.reply_text("❌ Ошибка: риелтор не найден.")
         return
 
-    # Get bot info for username
-    try:
-        bot_info = await context.bot.get_me()
-        bot_username = bot_info.username
-    except Exception:
-        bot_username = "Property_Batumi_bot"  # Fallback
-
-    # Generate referral link
-    referral_link = f"https://t.me/{bot_username}?start=ref_{user.id}"
+    # Bot.username is cached by Application.initialize() (getMe at startup)
+    referral_link = f"https://t.me/{context.bot.username}?start=ref_{user.id}"
 
     msg_text = (
         "🔗 <b>Ваша реферальная ссылка</b>\n\n"
@@ -265,7 +376,20 @@ async def client_detail_command(update: Update, context: ContextTypes.DEFAULT_TY
     if not user or not msg:
         return
 
-    if not await _is_realtor(user.id):
+    client_id: Optional[int] = None
+    if context.args:
+        with contextlib.suppress(ValueError):
+            client_id = int(context.args[0])
+
+    # Role check and client fetch are independent; the fetched client is only
+    # used once both the role and the ownership checks pass.
+    repo = _repo()
+    lookups = [is_realtor(user.id)]
+    if client_id is not None:
+        lookups.append(repo.get_client(client_id))
+    user_is_realtor, *fetched = await asyncio.gather(*lookups)
+
+    if not user_is_realtor:
         await msg.reply_text("⚠️ Только для риелторов.")
         return
 
@@ -277,15 +401,11 @@ async def client_detail_command(update: Update, context: ContextTypes.DEFAULT_TY
         )
         return
 
-    try:
-        client_id = int(context.args[0])
-    except ValueError:
+    if client_id is None:
         await msg.reply_text("❌ ID клиента должен быть числом.")
         return
 
-    repo = Container.get_repository()
-    client = await repo.get_client(client_id)
-
+    client = fetched[0]
     if not client:
         await msg.reply_text(f"❌ Клиент с ID {client_id} не найден.")
         return
@@ -294,53 +414,35 @@ async def client_detail_command(update: Update, context: ContextTypes.DEFAULT_TY
         await msg.reply_text("❌ У вас нет доступа к этому клиенту.")
         return
 
-    status_emoji = {
-        ClientStatus.NEW.value: "🆕",
-        ClientStatus.CONTACTED.value: "📞",
-        ClientStatus.VIEWING.value: "👁",
-        ClientStatus.CLOSED.value: "✅",
-        ClientStatus.REJECTED.value: "❌",
-    }
-    status = client.status.value if hasattr(client.status, "value") else str(client.status)
-    emoji = status_emoji.get(status, "❓")
+    status = client.status
+    emoji = _STATUS_EMOJI.get(status, "❓")
 
     created_str = client.created_at.strftime("%d.%m.%Y %H:%M")
+    telegram_line = f"🔗 Telegram: @{escape_html(client.telegram_username)}\n" if client.telegram_username else ""
+    notes_block = f"📝 <b>Дополнительно:</b>\n{escape_html(client.notes)}\n\n" if client.notes else ""
 
     text = (
         f"{emoji} <b>Клиент #{client.id}</b>\n\n"
         "📋 <b>Контакты:</b>\n"
-        f"👤 Имя: {client.name or '—'}\n"
-        + (f"🔗 Telegram: @{client.telegram_username}\n" if client.telegram_username else "")
-        + f"📞 Телефон: {client.contact or '—'}\n"
-        + f"🆔 Telegram ID: <code>{client.telegram_id}</code>\n\n"
+        f"👤 Имя: {_html_field(client.name)}\n"
+        f"{telegram_line}"
+        f"📞 Телефон: {_html_field(client.contact)}\n"
+        f"🆔 Telegram ID: <code>{client.telegram_id}</code>\n\n"
         "🎯 <b>Требования:</b>\n"
-        f"💰 Бюджет: {client.budget or '—'}\n"
-        f"🛏 Комнаты: {client.rooms or '—'}\n"
-        f"📐 Площадь: {client.size or '—'}\n"
-        f"📍 Локация: {client.location or '—'}\n"
-        f"🏗 Стадия: {client.ready_status or '—'}\n\n"
+        f"💰 Бюджет: {_html_field(client.budget)}\n"
+        f"🛏 Комнаты: {_html_field(client.rooms)}\n"
+        f"📐 Площадь: {_html_field(client.size)}\n"
+        f"📍 Локация: {_html_field(client.location)}\n"
+        f"🏗 Стадия: {_html_field(client.ready_status)}\n\n"
+        f"{notes_block}"
+        f"📊 <b>Статус:</b> {emoji} {status}\n"
+        f"📅 Добавлен: {created_str}\n"
     )
 
-    if client.notes:
-        text += f"📝 <b>Дополнительно:</b>\n{client.notes}\n\n"
-
-    text += f"📊 <b>Статус:</b> {emoji} {client.status}\n"
-    text += f"📅 Добавлен: {created_str}\n"
-
-    keyboard = [
-        [InlineKeyboardButton("📞 Позвонить", url=f"tel:{client.contact}")],
-        [
-            InlineKeyboardButton("✅ Закрыть", callback_data=f"status:{client.id}:{ClientStatus.CLOSED.value}"),
-            InlineKeyboardButton("❌ Отказ", callback_data=f"status:{client.id}:{ClientStatus.REJECTED.value}"),
-        ],
-    ]
-
-    if client.telegram_username:
-        keyboard[0].append(InlineKeyboardButton("💬 Написать", url=f"tg://user?id={client.telegram_id}"))
-
-    await msg.reply_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode="HTML")
+    await msg.reply_text(text, reply_markup=_build_client_keyboard(client), parse_mode="HTML")
 
 
+@per_user_queue
 @with_middleware
 async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Export clients placeholder."""
@@ -350,12 +452,11 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not user or not msg:
         return
 
-    if not await _is_realtor(user.id):
+    if not await is_realtor(user.id):
         await msg.reply_text("⚠️ Только для риелторов.")
         return
 
-    repo = Container.get_repository()
-    clients = await repo.get_clients_by_realtor(user.id)
+    clients = await get_realtor_clients_cached(user.id)
 
     if not clients:
         await msg.reply_text("📭 Нет клиентов для экспорта.")
@@ -367,6 +468,154 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
 
 
+async def _choose_existing_realtor_callback(
+    query: CallbackQuery, context: ContextTypes.DEFAULT_TYPE, user: User, arg: str
+) -> None:
+    """Client keeps their previous realtor: `choose_existing_realtor:<realtor_id>`."""
+    realtor = await _repo().get_realtor(int(arg))
+
+    if not realtor:
+        await query.edit_message_text("❌ Риелтор не найден.")
+        return
+
+    # Continue with existing realtor
+    context.user_data["client_info"] = ClientInfoDraft(
+        telegram_id=user.id,
+        realtor_id=realtor.id,
+        telegram_username=user.username,
+        name=user.full_name,
+    )
+    context.user_data["pending_realtor_choice"] = False
+
+    welcome_text = f"👋 С возвращением! Рада снова помочь с подбором недвижимости.\n\nДавайте уточним критерии — на какую сумму сейчас рассматриваете покупку? 💫"
+
+    await query.edit_message_text(welcome_text)
+
+    context.user_data["conversation"] = [
+        {"role": "system", "content": f"Риелтор: {realtor.full_name}"},
+        {"role": "assistant", "content": welcome_text}
+    ]
+
+
+async def _choose_new_realtor_callback(
+    query: CallbackQuery, context: ContextTypes.DEFAULT_TYPE, user: User, arg: str
+) -> None:
+    """Client switches to another realtor: `choose_new_realtor:<realtor_id>`."""
+    repo = _repo()
+    # Independent lookups: the previous client record is fetched alongside
+    new_realtor, existing_client = await asyncio.gather(
+        repo.get_realtor(int(arg)),
+        repo.get_client_by_telegram_global(user.id),
+    )
+
+    if not new_realtor:
+        await query.edit_message_text("❌ Риелтор не найден.")
+        return
+
+    # Client exists with old realtor: delete old record
+    if existing_client:
+        await repo.delete_client(existing_client.id)
+        invalidate_realtor_clients(existing_client.realtor_id)
+
+    # Continue with new realtor
+    context.user_data["client_info"] = ClientInfoDraft(
+        telegram_id=user.id,
+        realtor_id=new_realtor.id,
+        telegram_username=user.username,
+        name=user.full_name,
+    )
+    context.user_data["pending_realtor_choice"] = False
+
+    welcome_text = f"Здравствуйте! Меня зовут {new_realtor.full_name}, я риелтор по недвижимости в Батуми. Рада помочь с подбором квартиры! 💫\n\nДавайте начнём с бюджета — на какую сумму вы рассматриваете покупку?"
+
+    await query.edit_message_text(welcome_text)
+
+    context.user_data["conversation"] = [
+        {"role": "system", "content": f"Риелтор: {new_realtor.full_name}"},
+        {"role": "assistant", "content": welcome_text}
+    ]
+
+
+async def _client_card_callback(
+    query: CallbackQuery, context: ContextTypes.DEFAULT_TYPE, user: User, arg: str
+) -> None:
+    """Show a client card (realtor only): `client:<client_id>`."""
+    client = await _repo().get_client(int(arg))
+
+    if not client or client.realtor_id != user.id:
+        await query.edit_message_text("❌ Клиент не найден или нет доступа.")
+        return
+
+    notes_line = f"\n📝 {escape_html(client.notes)}" if client.notes else ""
+    text = (
+        f"<b>Клиент #{client.id}</b>\n\n"
+        f"👤 Имя: {_html_field(client.name)}\n"
+        f"📞 Телефон: {_html_field(client.contact)}\n"
+        f"💰 Бюджет: {_html_field(client.budget)}\n"
+        f"🛏 Комнаты: {_html_field(client.rooms)}\n"
+        f"📐 Площадь: {_html_field(client.size)}\n"
+        f"📍 Локация: {_html_field(client.location)}\n"
+        f"🏗 Стадия: {_html_field(client.ready_status)}\n"
+        f"{notes_line}"
+    )
+
+    await query.edit_message_text(
+        text,
+        reply_markup=_build_client_keyboard(client),
+        parse_mode="HTML",
+    )
+
+
+async def _status_change_callback(
+    query: CallbackQuery, context: ContextTypes.DEFAULT_TYPE, user: User, arg: str
+) -> None:
+    """Change a client's status (realtor only): `status:<client_id>:<status>`."""
+    client_id_str, _, new_status = arg.partition(":")
+    client = await _repo().get_client(int(client_id_str))
+    if not client or client.realtor_id != user.id:
+        await query.edit_message_text("❌ Клиент не найден или нет доступа.")
+        return
+
+    old_status = client.status
+    try:
+        new_status = ClientStatus(new_status).value
+    except ValueError:
+        logger.warning("Invalid status %r for client %s, using 'new'", new_status, client.id)
+        new_status = ClientStatus.NEW.value
+    logger.info("Client %s status %s -> %s by realtor %s", client.id, old_status, new_status, user.id)
+
+    # Status changes are batched by the status writer
+    try:
+        updated = await status_writer.submit(client.id, new_status)
+    except Exception:
+        logger.exception("Failed to update client %s status", client.id)
+        updated = False
+    if not updated:
+        await query.edit_message_text("❌ Не удалось изменить статус. Попробуйте ещё раз.")
+        return
+    invalidate_realtor_clients(client.realtor_id)
+
+    await query.edit_message_text(
+        "✅ Статус клиента #{id} изменён:\n{old} → {new}".format(
+            id=client.id,
+            old=_STATUS_NAMES.get(old_status, old_status),
+            new=_STATUS_NAMES.get(new_status, new_status),
+        ),
+        parse_mode="HTML",
+    )
+
+
+# Callback data is "<action>:<argument>"
+_CALLBACK_HANDLERS: Dict[
+    str, Callable[[CallbackQuery, ContextTypes.DEFAULT_TYPE, User, str], Awaitable[None]]
+] = {
+    "choose_existing_realtor": _choose_existing_realtor_callback,
+    "choose_new_realtor": _choose_new_realtor_callback,
+    "client": _client_card_callback,
+    "status": _status_change_callback,
+}
+
+
 @with_middleware
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle inline button callbacks."""
@@ -381,152 +630,103 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not user:
         return
 
-    data = query.data or ""
-
-    repo = Container.get_repository()
-
-    # Handle realtor choice for existing clients (available to all users)
-    if data.startswith("choose_existing_realtor:"):
-        realtor_id = int(data.split(":", 1)[1])
-        realtor = await repo.get_realtor(realtor_id)
-        
-        if not realtor:
-            await query.edit_message_text("❌ Риелтор не найден.")
-            return
-        
-        # Continue with existing realtor
-        context.user_data["client_info"] = {
-            "telegram_id": user.id,
-            "telegram_username": user.username,
-            "name": user.full_name,
-            "realtor_id": realtor.id,
-        }
-        context.user_data["conversation"] = []
-        context.user_data["pending_realtor_choice"] = False
-        
-        welcome_text = f"👋 С возвращением! Рада снова помочь с подбором недвижимости.\n\nДавайте уточним критерии — на какую сумму сейчас рассматриваете покупку? 💫"
-        
-        await query.edit_message_text(welcome_text)
-        
-        context.user_data["conversation"] = [
-            {"role": "system", "content": f"Риелтор: {realtor.full_name}"},
-            {"role": "assistant", "content": welcome_text}
-        ]
+    action, _, arg = (query.data or "").partition(":")
+    handler = _CALLBACK_HANDLERS.get(action)
+    if handler is None:
+        logger.warning("Unknown callback action %r from user %s", action, user.id)
         return
-    
-    if data.startswith("choose_new_realtor:"):
-        new_realtor_id = int(data.split(":", 1)[1])
-        new_realtor = await repo.get_realtor(new_realtor_id)
-        
-        if not new_realtor:
-            await query.edit_message_text("❌ Риелтор не найден.")
-            return
-        
-        # Check if client exists with old realtor and delete old record
-        existing_client = await repo.get_client_by_telegram_global(user.id)
-        if existing_client:
-            await repo.delete_client(existing_client.id)
-        
-        # Continue with new realtor
-        context.user_data["client_info"] = {
-            "telegram_id": user.id,
-            "telegram_username": user.username,
-            "name": user.full_name,
-            "realtor_id": new_realtor.id,
-        }
-        context.user_data["conversation"] = []
-        context.user_data["pending_realtor_choice"] = False
-        
-        welcome_text = f"Здравствуйте! Меня зовут {new_realtor.full_name}, я риелтор по недвижимости в Батуми. Рада помочь с подбором квартиры! 💫\n\nДавайте начнём с бюджета — на какую сумму вы рассматриваете покупку?"
-        
-        await query.edit_message_text(welcome_text)
-        
-        context.user_data["conversation"] = [
-            {"role": "system", "content": f"Риелтор: {new_realtor.full_name}"},
-            {"role": "assistant", "content": welcome_text}
-        ]
+
+    logger.debug("Callback %s:%s from user %s", action, arg, user.id)
+    await handler(query, context, user, arg)
+
+
+_DEVELOPER_NAMES_PATH = Path("./data/developer_names.json")
+_DEVELOPER_ADDRESSES_PATH = Path("./data/developer_addresses.json")
+
+# path -> (st_mtime_ns, mapping); re-read only when the file changes on disk
+_mapping_cache: Dict[Path, Tuple[int, Dict[str, str]]] = {}
+
+
+def _load_mapping(path: Path) -> Dict[str, str]:
+    """Load a JSON mapping file, cached by mtime. The result must not be modified."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    entry = _mapping_cache.get(path)
+    if entry and entry[0] == mtime:
+        return entry[1]
+
+    # Both parsers take UTF-8 bytes
+    mapping = _loads(path.read_bytes())
+    _mapping_cache[path] = (mtime, mapping)
+    return mapping
+
+
+async def _save_mapping(path: Path, mapping: Dict[str, str]) -> None:
+    await write_fsync(path, json.dumps(mapping, indent=2, ensure_ascii=False))
+    _mapping_cache.pop(path, None)
+
+
+_DEVELOPERS_USAGE_TEXT = (
+    "❌ Неверный формат.\n\n"
+    "<b>Название:</b> <code>/developers folder_3 Next Magnolia</code>\n"
+    "<b>Адрес:</b> <code>/developers address folder_3 \"ул. Пушкина 10\"</code>"
+)
+
+
+async def _developers_set_name(msg: Message, args: List[str]) -> None:
+    """`/developers folder_3 "Next Magnolia"`"""
+    if len(args) < 2:
+        await msg.reply_text(_DEVELOPERS_USAGE_TEXT, parse_mode="HTML")
         return
 
-    # View client (realtor only)
-    if data.startswith("client:"):
-        client_id = int(data.split(":", 1)[1])
-        client = await repo.get_client(client_id)
-
-        if not client or client.realtor_id != user.id:
-            await query.edit_message_text("❌ Клиент не найден или нет доступа.")
-            return
-
-        text = (
-            f"<b>Клиент #{client.id}</b>\n\n"
-            f"👤 Имя: {client.name or '—'}\n"
-            f"📞 Телефон: {client.contact or '—'}\n"
-            f"💰 Бюджет: {client.budget or '—'}\n"
-            f"🛏 Комнаты: {client.rooms or '—'}\n"
-            f"📐 Площадь: {client.size or '—'}\n"
-            f"📍 Локация: {client.location or '—'}\n"
-            f"🏗 Стадия: {client.ready_status or '—'}\n"
-        )
-        if client.notes:
-            text += f"\n📝 {client.notes}"
-
-        keyboard = []
-        
-        # Add Telegram message button if username exists
-        if client.telegram_username:
-            keyboard.append([InlineKeyboardButton("💬 Написать в Telegram", url=f"https://t.me/{client.telegram_username}")])
-        
-        # Only add call button if contact looks like a phone number
-        if client.contact and client.contact.startswith("+"):
-            keyboard.append([InlineKeyboardButton("📞 Позвонить", url=f"tel:{client.contact}")])
-        
-        keyboard.append([
-            InlineKeyboardButton("✅ Закрыть", callback_data=f"status:{client.id}:{ClientStatus.CLOSED.value}"),
-            InlineKeyboardButton("❌ Отказ", callback_data=f"status:{client.id}:{ClientStatus.REJECTED.value}"),
-        ])
-
-        await query.edit_message_text(
-            text,
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode="HTML",
-        )
+    folder_key = args[0]
+    display_name = ' '.join(args[1:]).strip('"\'')
+
+    await _save_mapping(
+        _DEVELOPER_NAMES_PATH,
+        {**_load_mapping(_DEVELOPER_NAMES_PATH), folder_key: display_name},
+    )
+    await msg.reply_text(
+        f"✅ Название обновлено: <b>{escape_html(folder_key)}</b> → <b>{escape_html(display_name)}</b>\n\n"
+        f"Изменения применятся сразу!",
+        parse_mode="HTML"
+    )
+
+
+async def _developers_set_address(msg: Message, args: List[str]) -> None:
+    """`/developers address folder_3 "ул. Пушкина 10"`"""
+    if len(args) < 3:
+        await msg.reply_text(_DEVELOPERS_USAGE_TEXT, parse_mode="HTML")
         return
 
-    # Status change
-    if data.startswith("status:"):
-        _, client_id_str, new_status = data.split(":", 2)
-        client_id = int(client_id_str)
-
-        client = await repo.get_client(client_id)
-        if not client or client.realtor_id != user.id:
-            await query.edit_message_text("❌ Клиент не найден или нет доступа.")
-            return
-
-        old_status = client.status.value if hasattr(client.status, "value") else str(client.status)
-        try:
-            client.status = ClientStatus(new_status)
-        except ValueError:
-            client.status = ClientStatus.NEW
-
-        await repo.update_client(client)
-
-        status_names = {
-            ClientStatus.NEW.value: "Новый",
-            ClientStatus.CONTACTED.value: "Связались",
-            ClientStatus.VIEWING.value: "На просмотре",
-            ClientStatus.CLOSED.value: "Закрыт",
-            ClientStatus.REJECTED.value: "Отказ",
-        }
-
-        await query.edit_message_text(
-            "✅ Статус клиента #{id} изменён:\n{old} → {new}".format(
-                id=client.id,
-                old=status_names.get(old_status, old_status),
-                new=status_names.get(new_status, new_status),
-            ),
-            parse_mode="HTML",
+    folder_key = args[1]
+    if not folder_key.startswith('folder_'):
+        await msg.reply_text(
+            "❌ Неверный формат ключа. Используйте: folder_1, folder_2, etc."
         )
         return
 
+    address = ' '.join(args[2:]).strip('"\'')
+    await _save_mapping(
+        _DEVELOPER_ADDRESSES_PATH,
+        {**_load_mapping(_DEVELOPER_ADDRESSES_PATH), folder_key: address},
+    )
+    await msg.reply_text(
+        f"✅ Адрес обновлён: <b>{escape_html(folder_key)}</b>\n"
+        f"📍 {escape_html(address)}\n\n"
+        f"Изменения применятся сразу!",
+        parse_mode="HTML"
+    )
+
+
+# Keyed by the lowercased first argument; "folder_*" keys go to _developers_set_name
+_DEVELOPERS_SUBCOMMANDS: Dict[str, Callable[[Message, List[str]], Awaitable[None]]] = {
+    "address": _developers_set_address,
+}
+
 
 @with_middleware
 async def developers_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -535,74 +735,27 @@ async def developers_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
 
     user = update.effective_user
-    if not await _is_realtor(user.id):
+    if not await is_realtor(user.id):
         await update.effective_message.reply_text(
             "❌ Эта команда только для риелторов."
         )
         return
 
-    # Load current mappings
-    names_path = Path("./data/developer_names.json")
-    addresses_path = Path("./data/developer_addresses.json")
-
-    if names_path.exists():
-        with open(names_path, 'r', encoding='utf-8') as f:
-            names_mapping = json.load(f)
-    else:
-        names_mapping = {}
-
-    if addresses_path.exists():
-        with open(addresses_path, 'r', encoding='utf-8') as f:
-            addresses_mapping = json.load(f)
-    else:
-        addresses_mapping = {}
-
-    # Check for subcommand: /developers address folder_3 "ул. Пушкина 10"
-    if context.args and len(context.args) >= 1:
-        if context.args[0].lower() == 'address' and len(context.args) >= 3:
-            # Format: /developers address folder_3 "ул. Пушкина 10"
-            folder_key = context.args[1]
-            address = ' '.join(context.args[2:]).strip('"\'')
-
-            if folder_key.startswith('folder_'):
-                addresses_mapping[folder_key] = address
-                with open(addresses_path, 'w', encoding='utf-8') as f:
-                    json.dump(addresses_mapping, f, indent=2, ensure_ascii=False)
-                await update.effective_message.reply_text(
-                    f"✅ Адрес обновлён: <b>{folder_key}</b>\n"
-                    f"📍 {address}\n\n"
-                    f"Изменения применятся сразу!",
-                    parse_mode="HTML"
-                )
-                return
-            else:
-                await update.effective_message.reply_text(
-                    "❌ Неверный формат ключа. Используйте: folder_1, folder_2, etc."
-                )
-                return
-
-        elif context.args[0].startswith('folder_') and len(context.args) >= 2:
-            # Format: /developers folder_3 "Next Magnolia"
-            folder_key = context.args[0]
-            display_name = ' '.join(context.args[1:]).strip('"\'')
-
-            names_mapping[folder_key] = display_name
-            with open(names_path, 'w', encoding='utf-8') as f:
-                json.dump(names_mapping, f, indent=2, ensure_ascii=False)
-            await update.effective_message.reply_text(
-                f"✅ Название обновлено: <b>{folder_key}</b> → <b>{display_name}</b>\n\n"
-                f"Изменения применятся сразу!",
-                parse_mode="HTML"
-            )
-            return
+    # Subcommands: /developers folder_3 ..., /developers address folder_3 ...
+    args = context.args
+    if args:
+        subcommand = _DEVELOPERS_SUBCOMMANDS.get(args[0].lower())
+        if subcommand is None and args[0].startswith('folder_'):
+            subcommand = _developers_set_name
 
+        if subcommand is None:
+            await update.effective_message.reply_text(_DEVELOPERS_USAGE_TEXT, parse_mode="HTML")
         else:
-            await update.effective_message.reply_text(
-                "❌ Неверный формат.\n\n"
-                "<b>Название:</b> <code>/developers folder_3 Next Magnolia</code>\n"
-                "<b>Адрес:</b> <code>/developers address folder_3 \"ул. Пушкина 10\"</code>"
-            )
-            return
+            await subcommand(update.effective_message, args)
+        return
+
+    names_mapping = _load_mapping(_DEVELOPER_NAMES_PATH)
+    addresses_mapping = _load_mapping(_DEVELOPER_ADDRESSES_PATH)
 
     # Show current mapping
     lines = ["🏗 <b>Застройщики</b> (название + адрес)\n"]
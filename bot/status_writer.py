@@ -0,0 +1,136 @@
+"""Coalescing writer for client status changes.
+
+Status buttons are pressed in bursts (a realtor tapping through a list, many
+realtors at once). Instead of one repository write per press, changes are
+queued and flushed in batches through `bulk_update_client_status`.
+
+The writer is started from the application's post_init hook (`start()`) and
+flushed on shutdown (`stop()`). While it is not running, `submit()` writes
+directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from core.container import Container
+
+
+logger = logging.getLogger(__name__)
+
+STATUS_BATCH_MAX_SIZE = 500
+# How long the writer waits for more changes after the first one of a batch
+STATUS_BATCH_MAX_WAIT = 0.02
+# Callers give up waiting if the writer falls this far behind
+STATUS_SUBMIT_TIMEOUT = 10.0
+
+_Item = Tuple[int, str, asyncio.Future]
+
+_queue: Optional[asyncio.Queue[_Item]] = None
+_writer_task: Optional[asyncio.Task] = None
+
+
+async def _drain(queue: asyncio.Queue[_Item]) -> List[_Item]:
+    """Wait for one change, then collect more for up to STATUS_BATCH_MAX_WAIT."""
+    batch = [await queue.get()]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STATUS_BATCH_MAX_WAIT
+
+    while len(batch) < STATUS_BATCH_MAX_SIZE:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout))
+        except asyncio.TimeoutError:
+            break
+
+    return batch
+
+
+async def _run(queue: asyncio.Queue[_Item]) -> None:
+    while True:
+        batch = await _drain(queue)
+
+        # Later presses for the same client win
+        statuses: Dict[int, str] = {client_id: status for client_id, status, _ in batch}
+        try:
+            updated = await Container.get_repository().bulk_update_client_status(statuses)
+        except Exception as e:
+            logger.exception("Failed to write %d client status changes", len(statuses))
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            logger.debug("Wrote %d client status changes", len(updated))
+            for client_id, _, future in batch:
+                if not future.done():
+                    future.set_result(client_id in updated)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+async def submit(client_id: int, status: str) -> bool:
+    """Queue a status change and wait until it is written.
+
+    Args:
+        client_id: Client ID.
+        status: New status value.
+
+    Returns:
+        True if the client exists and was updated.
+
+    Raises:
+        asyncio.TimeoutError: If the write doesn't complete within
+            STATUS_SUBMIT_TIMEOUT.
+    """
+    status = getattr(status, "value", status)
+    if _queue is None:
+        return await Container.get_repository().update_client_fields(client_id, status=status)
+
+    future = asyncio.get_running_loop().create_future()
+    _queue.put_nowait((client_id, status, future))
+    # Shielded: a caller timing out doesn't cancel the result for the batch
+    return await asyncio.wait_for(asyncio.shield(future), STATUS_SUBMIT_TIMEOUT)
+
+
+def start() -> None:
+    """Start the writer task on the running event loop."""
+    global _queue, _writer_task
+
+    if _writer_task is not None:
+        return
+    _queue = asyncio.Queue()
+    _writer_task = asyncio.create_task(_run(_queue))
+
+
+async def stop() -> None:
+    """Write pending changes and stop the writer task."""
+    global _queue, _writer_task
+
+    queue, task = _queue, _writer_task
+    if queue is None or task is None:
+        return
+
+    # New submissions write directly from here on
+    _queue = None
+    _writer_task = None
+
+    await queue.join()
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+__all__ = [
+    "STATUS_BATCH_MAX_SIZE",
+    "STATUS_BATCH_MAX_WAIT",
+    "STATUS_SUBMIT_TIMEOUT",
+    "submit",
+    "start",
+    "stop",
+]
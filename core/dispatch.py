@@ -0,0 +1,114 @@
+"""
+Per-user dispatch for slow handlers.
+
+PTB processes updates one at a time, so a handler waiting on a slow
+repository call holds up every other chat. Handlers wrapped with
+`per_user_queue` return immediately; the work runs on a worker task per user,
+which keeps one user's commands in order without blocking anyone else.
+A global semaphore caps how many queued handlers run at once.
+"""
+import asyncio
+import logging
+from collections import deque
+from functools import wraps
+from typing import Awaitable, Callable, Deque, Dict
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_MAX_CONCURRENCY = 32
+DISPATCH_STOP_TIMEOUT = 10.0
+
+_QUEUED_TEXT = "⏳ Запрос в очереди, ответ придёт чуть позже."
+
+_Job = Callable[[], Awaitable[None]]
+
+_queues: Dict[int, Deque[_Job]] = {}
+_workers: set[asyncio.Task] = set()
+_semaphore = asyncio.Semaphore(DISPATCH_MAX_CONCURRENCY)
+
+
+async def _worker(user_id: int, queue: Deque[_Job]) -> None:
+    try:
+        while queue:
+            job = queue.popleft()
+            try:
+                async with _semaphore:
+                    await job()
+            except Exception:
+                logger.exception("Queued handler failed for user %s", user_id)
+    finally:
+        # No await between the empty check and here, so nothing can be
+        # queued onto a worker that is about to exit
+        if _queues.get(user_id) is queue:
+            del _queues[user_id]
+
+
+def dispatch_to_user(user_id: int, job: _Job) -> bool:
+    """Run `job` after the user's earlier jobs, without waiting for it.
+
+    Returns:
+        True if the job can't start right away (the user has work queued or
+        all slots are busy).
+    """
+    queue = _queues.get(user_id)
+    delayed = queue is not None or _semaphore.locked()
+
+    if queue is None:
+        queue = _queues[user_id] = deque()
+        task = asyncio.create_task(_worker(user_id, queue))
+        _workers.add(task)
+        task.add_done_callback(_workers.discard)
+    queue.append(job)
+    return delayed
+
+
+def per_user_queue(handler: Callable) -> Callable:
+    """
+    Decorator: run the handler through `dispatch_to_user`.
+
+    Apply it outside `with_middleware` so that error handling and logging run
+    with the queued handler. The user is told when the request has to wait.
+    """
+    @wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        user = update.effective_user
+        if not user:
+            await handler(update, context)
+            return
+
+        if dispatch_to_user(user.id, lambda: handler(update, context)):
+            msg = update.effective_message
+            if msg:
+                await msg.reply_text(_QUEUED_TEXT)
+
+    return wrapper
+
+
+async def stop() -> None:
+    """Let queued handlers finish (up to DISPATCH_STOP_TIMEOUT), then cancel the rest.
+
+    Must run while the bot is still initialized (post_stop), since queued
+    handlers reply to their users.
+    """
+    if not _workers:
+        return
+
+    _, pending = await asyncio.wait(set(_workers), timeout=DISPATCH_STOP_TIMEOUT)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning("Cancelled %d queued handler workers on shutdown", len(pending))
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+__all__ = [
+    "DISPATCH_MAX_CONCURRENCY",
+    "DISPATCH_STOP_TIMEOUT",
+    "dispatch_to_user",
+    "per_user_queue",
+    "stop",
+]
@@ -3,11 +3,13 @@ LLM integration service with provider abstraction and fallback chain.
 
 Supports multiple LLM providers (OpenAI, Anthropic) with automatic fallback.
 """
+import asyncio
 import json
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, AsyncIterator
+from pathlib import Path
+from typing import List, Dict, Optional, AsyncIterator, BinaryIO, Union
 from enum import Enum
 
 from tenacity import (
@@ -19,6 +21,14 @@ from tenacity import (
 
 from bot.config import settings, LLMProvider
 
+# Optional faster JSON parser for extraction responses. orjson.JSONDecodeError
+# subclasses json.JSONDecodeError, so error handling is the same either way.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 logger = logging.getLogger(__name__)
 
@@ -401,6 +411,61 @@ class LLMService:
         logger.error("All LLM providers failed")
         return None
     
+    async def generate_response_stream(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate streaming response with fallback chain.
+        
+        Falls back to the next provider only while nothing has been yielded
+        yet; a failure mid-stream ends the stream with the text produced so far.
+        
+        Args:
+            messages: Conversation messages
+            system_prompt: Optional system prompt
+            
+        Yields:
+            Text chunks as they are generated
+        """
+        if system_prompt is None:
+            system_prompt = self.REALTOR_BOT_SYSTEM_PROMPT
+        
+        for provider_type in self.provider_order:
+            provider = self.providers.get(provider_type)
+            
+            if not provider:
+                logger.warning(f"Provider {provider_type.value} not configured, skipping")
+                continue
+            
+            started = False
+            try:
+                logger.info(f"Attempting streaming generation with {provider_type.value}")
+                
+                async for chunk in provider.generate_response_stream(
+                    messages=messages,
+                    system_prompt=system_prompt,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens
+                ):
+                    started = True
+                    yield chunk
+                
+                return
+                
+            except Exception as e:
+                if started:
+                    logger.error(f"Streaming with {provider_type.value} failed mid-response: {e}")
+                    return
+                logger.error(
+                    f"Failed to stream with {provider_type.value}: {e}, "
+                    "trying next provider"
+                )
+                continue
+        
+        logger.error("All LLM providers failed")
+    
     async def extract_client_info(
         self,
         conversation_history: List[Dict[str, str]]
@@ -416,7 +481,11 @@ class LLMService:
         """
         extraction_message = {
             "role": "user",
-            "content": f"Диалог:\n{json.dumps(conversation_history, ensure_ascii=False, indent=2)}"
+            # Compact separators: the transcript is re-encoded on every turn and
+            # indentation only adds tokens to the request.
+            "content": "Диалог:\n" + json.dumps(
+                conversation_history, ensure_ascii=False, separators=(",", ":")
+            )
         }
         
         response = await self.generate_response(
@@ -434,21 +503,56 @@ class LLMService:
             
             if json_start >= 0 and json_end > json_start:
                 json_str = response[json_start:json_end]
-                return json.loads(json_str)
+                return _loads(json_str)
             
-            return json.loads(response)
+            return _loads(response)
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse extraction response: {e}")
             return {"is_complete": False}
     
-    async def transcribe_audio(self, audio_path: str) -> Optional[str]:
+    async def transcribe_audio(
+        self,
+        audio: Union[str, Path, bytes, bytearray, BinaryIO],
+        mime: str = "audio/ogg"
+    ) -> Optional[str]:
+        """
+        Transcribe audio using Groq Whisper API (free tier).
+        Falls back to OpenAI if Groq is not configured.
+        
+        Args:
+            audio: Path to audio file, raw audio bytes or a binary file object
+            mime: Audio MIME type
+            
+        Returns:
+            Transcribed text or None if failed
+        """
+        filename = "audio.oga"
+        
+        # Don't block the event loop on disk reads
+        if isinstance(audio, (str, Path)):
+            filename = os.path.basename(audio) or filename
+            audio = await asyncio.to_thread(Path(audio).read_bytes)
+        elif not isinstance(audio, (bytes, bytearray)):
+            filename = os.path.basename(getattr(audio, "name", "") or "") or filename
+            audio = await asyncio.to_thread(audio.read)
+        
+        return await self.transcribe_audio_bytes(bytes(audio), filename=filename, mime=mime)
+    
+    async def transcribe_audio_bytes(
+        self,
+        audio: bytes,
+        filename: str = "audio.oga",
+        mime: str = "audio/ogg"
+    ) -> Optional[str]:
         """
-        Transcribe audio file using Groq Whisper API (free tier).
+        Transcribe in-memory audio using Groq Whisper API (free tier).
         Falls back to OpenAI if Groq is not configured.
         
         Args:
-            audio_path: Path to audio file
+            audio: Raw audio bytes
+            filename: File name reported to the API (used to detect format)
+            mime: Audio MIME type
             
         Returns:
             Transcribed text or None if failed
@@ -461,22 +565,21 @@ class LLMService:
                 import httpx
                 
                 async with httpx.AsyncClient(timeout=60.0) as client:
-                    with open(audio_path, "rb") as audio_file:
-                        files = {"file": ("audio.oga", audio_file, "audio/ogg")}
-                        data = {"model": "whisper-large-v3", "language": "ru"}
-                        headers = {"Authorization": f"Bearer {groq_key}"}
-                        
-                        response = await client.post(
-                            "https://api.groq.com/openai/v1/audio/transcriptions",
-                            headers=headers,
-                            files=files,
-                            data=data
-                        )
-                        response.raise_for_status()
-                        result = response.json()
-                        
-                        logger.info("Transcribed audio using Groq (free)")
-                        return result.get("text")
+                    files = {"file": (filename, audio, mime)}
+                    data = {"model": "whisper-large-v3", "language": "ru"}
+                    headers = {"Authorization": f"Bearer {groq_key}"}
+                    
+                    response = await client.post(
+                        "https://api.groq.com/openai/v1/audio/transcriptions",
+                        headers=headers,
+                        files=files,
+                        data=data
+                    )
+                    response.raise_for_status()
+                    result = response.json()
+                    
+                    logger.info("Transcribed audio using Groq (free)")
+                    return result.get("text")
                         
             except Exception as e:
                 logger.warning(f"Groq transcription failed: {e}, falling back to OpenAI")
@@ -489,11 +592,10 @@ class LLMService:
             return None
         
         try:
-            with open(audio_path, "rb") as audio_file:
-                transcript = await openai_provider.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file
-                )
+            transcript = await openai_provider.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(filename, audio, mime)
+            )
             
             return transcript.text
             
@@ -0,0 +1,167 @@
+"""
+Short-lived cache for realtor lookups.
+
+Realtor membership changes rarely, but it is checked on almost every update
+(/start routing, realtor-only commands). Lookups are cached for a short time;
+write paths must call `invalidate_realtor_cache()`.
+
+A realtor's full client list (/export) is cached the same way;
+client writes must call `invalidate_realtor_clients()`.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import List, Optional
+
+from core.container import Container
+from database.models import ClientModel, RealtorModel
+
+
+logger = logging.getLogger(__name__)
+
+REALTOR_CACHE_TTL = 60.0
+REALTOR_CACHE_MAX_SIZE = 1024
+REALTOR_CLIENTS_CACHE_TTL = 15.0
+
+_realtor_cache: dict[int, tuple[float, Optional[RealtorModel]]] = {}
+# Role checks only need a bool; kept apart so they don't load full records
+_is_realtor_cache: dict[int, tuple[float, bool]] = {}
+_all_realtors_cache: tuple[float, List[RealtorModel]] = (0.0, [])
+# In-flight fetches: concurrent misses for the same key share one query,
+# misses for different keys don't wait on each other
+_realtor_fetches: dict[int, asyncio.Future] = {}
+_all_realtors_fetch: Optional[asyncio.Future] = None
+
+_clients_cache: dict[int, tuple[float, List[ClientModel]]] = {}
+# Bumped on invalidation so a fetch that raced with a write isn't cached
+_clients_version: defaultdict[int, int] = defaultdict(int)
+_clients_locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _is_fresh(ts: float) -> bool:
+    return time.monotonic() - ts < REALTOR_CACHE_TTL
+
+
+def invalidate_realtor_cache(user_id: Optional[int] = None) -> None:
+    """Drop cached realtor lookups (one user, or everything if `user_id` is None)."""
+    global _all_realtors_cache
+
+    if user_id is None:
+        _realtor_cache.clear()
+        _is_realtor_cache.clear()
+    else:
+        _realtor_cache.pop(user_id, None)
+        _is_realtor_cache.pop(user_id, None)
+    _all_realtors_cache = (0.0, [])
+
+
+async def _fetch_realtor(user_id: int) -> Optional[RealtorModel]:
+    logger.debug("Realtor cache miss for %s", user_id)
+    realtor = await Container.get_repository().get_realtor(user_id)
+
+    if len(_realtor_cache) >= REALTOR_CACHE_MAX_SIZE:
+        for key in [k for k, (ts, _) in _realtor_cache.items() if not _is_fresh(ts)]:
+            del _realtor_cache[key]
+    _realtor_cache[user_id] = (time.monotonic(), realtor)
+    return realtor
+
+
+async def get_realtor_cached(user_id: int) -> Optional[RealtorModel]:
+    """Get realtor by ID through the TTL cache (misses are cached too)."""
+    entry = _realtor_cache.get(user_id)
+    if entry and _is_fresh(entry[0]):
+        return entry[1]
+
+    fetch = _realtor_fetches.get(user_id)
+    if fetch is None:
+        fetch = _realtor_fetches[user_id] = asyncio.ensure_future(_fetch_realtor(user_id))
+        fetch.add_done_callback(lambda _: _realtor_fetches.pop(user_id, None))
+
+    # Shielded so a cancelled caller doesn't abort the fetch for the others
+    return await asyncio.shield(fetch)
+
+
+async def _fetch_all_realtors() -> List[RealtorModel]:
+    global _all_realtors_cache
+
+    realtors = await Container.get_repository().get_all_realtors()
+    _all_realtors_cache = (time.monotonic(), realtors)
+    return realtors
+
+
+async def get_all_realtors_cached() -> List[RealtorModel]:
+    """Get all realtors through the TTL cache."""
+    global _all_realtors_fetch
+
+    ts, realtors = _all_realtors_cache
+    if ts and _is_fresh(ts):
+        return realtors
+
+    if _all_realtors_fetch is None or _all_realtors_fetch.done():
+        _all_realtors_fetch = asyncio.ensure_future(_fetch_all_realtors())
+    return await asyncio.shield(_all_realtors_fetch)
+
+
+async def is_realtor(user_id: int) -> bool:
+    """Check whether the user is a registered realtor."""
+    # A full record already cached by get_realtor_cached answers it as well
+    entry = _realtor_cache.get(user_id)
+    if entry and _is_fresh(entry[0]):
+        return entry[1] is not None
+
+    flag = _is_realtor_cache.get(user_id)
+    if flag and _is_fresh(flag[0]):
+        return flag[1]
+
+    logger.debug("Realtor role cache miss for %s", user_id)
+    exists = await Container.get_repository().realtor_exists(user_id)
+
+    if len(_is_realtor_cache) >= REALTOR_CACHE_MAX_SIZE:
+        for key in [k for k, (ts, _) in _is_realtor_cache.items() if not _is_fresh(ts)]:
+            del _is_realtor_cache[key]
+    _is_realtor_cache[user_id] = (time.monotonic(), exists)
+    return exists
+
+
+def invalidate_realtor_clients(realtor_id: Optional[int]) -> None:
+    """Drop the cached client list of a realtor."""
+    if realtor_id is None:
+        return
+    _clients_cache.pop(realtor_id, None)
+    _clients_version[realtor_id] += 1
+
+
+async def get_realtor_clients_cached(realtor_id: int) -> List[ClientModel]:
+    """Get a realtor's clients through the TTL cache.
+
+    The returned list is shared between callers and must not be modified.
+    """
+    entry = _clients_cache.get(realtor_id)
+    if entry and time.monotonic() - entry[0] < REALTOR_CLIENTS_CACHE_TTL:
+        return entry[1]
+
+    # Per-realtor lock: concurrent misses share one query
+    async with _clients_locks[realtor_id]:
+        entry = _clients_cache.get(realtor_id)
+        if entry and time.monotonic() - entry[0] < REALTOR_CLIENTS_CACHE_TTL:
+            return entry[1]
+
+        logger.debug("Client list cache miss for realtor %s", realtor_id)
+        version = _clients_version[realtor_id]
+        clients = await Container.get_repository().get_clients_by_realtor(realtor_id)
+        if version == _clients_version[realtor_id]:
+            _clients_cache[realtor_id] = (time.monotonic(), clients)
+        return clients
+
+
+__all__ = [
+    "REALTOR_CACHE_TTL",
+    "REALTOR_CLIENTS_CACHE_TTL",
+    "invalidate_realtor_cache",
+    "get_realtor_cached",
+    "get_all_realtors_cached",
+    "is_realtor",
+    "invalidate_realtor_clients",
+    "get_realtor_clients_cached",
+]
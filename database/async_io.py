@@ -0,0 +1,64 @@
+"""Durable file writes for file-based storage.
+
+Data is written to a temporary file in the target's directory, fsynced and
+renamed over the target, so readers see either the old or the new content,
+never a partially written file. The async variant does the blocking work in
+a worker thread (one hop for the whole write + fsync + rename).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+# Read once at import: os.umask() can only be queried by setting it, which
+# isn't safe from the worker threads the writes run in.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write_text(path: Union[str, Path], data: str) -> None:
+    """Atomically replace a file's content.
+
+    Args:
+        path: Target file.
+        data: Text to write (UTF-8).
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        # mkstemp creates the file as 0600; keep the target's permissions
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+async def write_fsync(path: Union[str, Path], data: str) -> None:
+    """Atomically replace a file's content without blocking the event loop.
+
+    Args:
+        path: Target file.
+        data: Text to write (UTF-8).
+    """
+    await asyncio.to_thread(atomic_write_text, path, data)
+
+
+__all__ = ["atomic_write_text", "write_fsync"]
@@ -1,18 +1,24 @@
 """JSON-based repository implementation for backward compatibility."""
 import json
 import os
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import asyncio
 from datetime import datetime
+from enum import Enum
 
 import aiofiles
 
+from database.async_io import write_fsync
 from database.models import RealtorModel, ClientModel
 from database.repository import BaseRepository
 from bot.config import ClientStatus
 
 
+_CLIENT_STATUS_VALUES = frozenset(status.value for status in ClientStatus)
+
+
 class JSONRepository(BaseRepository):
     """
     JSON file-based repository with async operations.
@@ -54,9 +60,8 @@ class JSONRepository(BaseRepository):
             return json.loads(content)
     
     async def _save_data(self, data: Dict) -> None:
-        """Save data to JSON file asynchronously."""
-        async with aiofiles.open(self.db_path, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(data, ensure_ascii=False, indent=2))
+        """Save data to JSON file atomically, off the event loop."""
+        await write_fsync(self.db_path, json.dumps(data, ensure_ascii=False, indent=2))
     
     # Realtor operations
     
@@ -106,6 +111,19 @@ class JSONRepository(BaseRepository):
         
         return RealtorModel(**realtor_data)
     
+    async def realtor_exists(self, realtor_id: int) -> bool:
+        """
+        Check whether a realtor is registered without building the model.
+        
+        Args:
+            realtor_id: Realtor Telegram ID
+            
+        Returns:
+            True if the realtor exists
+        """
+        data = await self._load_data()
+        return bool(data["realtors"].get(str(realtor_id)))
+    
     async def update_realtor(self, realtor: RealtorModel) -> RealtorModel:
         """
         Update realtor information.
@@ -249,10 +267,71 @@ class JSONRepository(BaseRepository):
             
             return client
     
+    async def update_client_fields(self, client_id: int, **fields: Any) -> bool:
+        """
+        Update selected client fields without loading a full model.
+        
+        Values are stored as given, so callers pass validated values
+        (e.g. from `ClientModel.model_dump()`).
+        
+        Args:
+            client_id: Client ID
+            **fields: Field values to set
+            
+        Returns:
+            True if updated, False if not found
+        """
+        async with self._lock:
+            data = await self._load_data()
+            client_data = data["clients"].get(str(client_id))
+            
+            if not client_data:
+                return False
+            
+            for field, value in fields.items():
+                if isinstance(value, Enum):
+                    value = value.value
+                elif isinstance(value, datetime):
+                    value = value.isoformat()
+                client_data[field] = value
+            
+            await self._save_data(data)
+            
+            return True
+    
+    async def bulk_update_client_status(self, statuses: Dict[int, str]) -> Set[int]:
+        """
+        Set the status of several clients with a single file write.
+        
+        Args:
+            statuses: Mapping of client ID to new status value
+            
+        Returns:
+            IDs of the clients that were found and updated
+        """
+        updated: Set[int] = set()
+        
+        async with self._lock:
+            data = await self._load_data()
+            clients = data["clients"]
+            
+            for client_id, status in statuses.items():
+                client_data = clients.get(str(client_id))
+                if client_data:
+                    client_data["status"] = getattr(status, "value", status)
+                    updated.add(client_id)
+            
+            if updated:
+                await self._save_data(data)
+        
+        return updated
+    
     async def get_clients_by_realtor(
         self,
         realtor_id: int,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[ClientModel]:
         """
         Get all clients for a realtor.
@@ -260,12 +339,15 @@ class JSONRepository(BaseRepository):
         Args:
             realtor_id: Realtor ID
             status: Optional status filter
+            limit: Maximum number of clients to return (all if None)
+            offset: Number of matching clients to skip
             
         Returns:
             List of client models
         """
         data = await self._load_data()
         clients = []
+        skipped = 0
         
         for client_data in data["clients"].values():
             if client_data.get("realtor_id") != realtor_id:
@@ -275,6 +357,13 @@ class JSONRepository(BaseRepository):
             if status and client_data.get("status") != status:
                 continue
             
+            # Only the requested page is parsed into models
+            if skipped < offset:
+                skipped += 1
+                continue
+            if limit is not None and len(clients) >= limit:
+                break
+            
             # Parse datetime fields
             if isinstance(client_data.get("created_at"), str):
                 client_data["created_at"] = datetime.fromisoformat(
@@ -298,6 +387,30 @@ class JSONRepository(BaseRepository):
         
         return clients
     
+    async def count_clients_by_status(self, realtor_id: int) -> Dict[str, int]:
+        """
+        Count a realtor's clients per status without building models.
+        
+        Args:
+            realtor_id: Realtor ID
+            
+        Returns:
+            Mapping of status value to client count
+        """
+        data = await self._load_data()
+        statuses = Counter(
+            client_data.get("status", ClientStatus.NEW.value)
+            for client_data in data["clients"].values()
+            if client_data.get("realtor_id") == realtor_id
+        )
+        
+        # Same fallback as model parsing: unknown statuses count as "new"
+        counts: Dict[str, int] = {}
+        for status, count in statuses.items():
+            key = status if status in _CLIENT_STATUS_VALUES else ClientStatus.NEW.value
+            counts[key] = counts.get(key, 0) + count
+        return counts
+    
     async def get_client_by_telegram(
         self,
         telegram_id: int,
@@ -343,6 +456,63 @@ class JSONRepository(BaseRepository):
         
         return None
     
+    async def resolve_start_context(
+        self,
+        user_id: int
+    ) -> Tuple[Optional[RealtorModel], Optional[ClientModel], Optional[RealtorModel]]:
+        """Get everything /start needs from a single file read.
+        
+        Args:
+            user_id: Telegram ID of the user
+            
+        Returns:
+            Tuple of (realtor with this ID, client with this Telegram ID,
+            realtor of that client); missing entries are None
+        """
+        data = await self._load_data()
+        realtors = data["realtors"]
+        
+        def parse_realtor(realtor_id: int) -> Optional[RealtorModel]:
+            realtor_data = realtors.get(str(realtor_id))
+            if not realtor_data:
+                return None
+            if isinstance(realtor_data.get("created_at"), str):
+                realtor_data["created_at"] = datetime.fromisoformat(
+                    realtor_data["created_at"]
+                )
+            return RealtorModel(**realtor_data)
+        
+        # Same precedence as get_client_by_telegram_global(): first match
+        # in realtor order, then in client order.
+        by_realtor: Dict[str, Dict] = {}
+        for candidate in data["clients"].values():
+            if candidate.get("telegram_id") == user_id:
+                by_realtor.setdefault(str(candidate.get("realtor_id")), candidate)
+        client_data = next(
+            (by_realtor[key] for key in realtors if key in by_realtor),
+            None
+        )
+        
+        client = None
+        if client_data:
+            if isinstance(client_data.get("created_at"), str):
+                client_data["created_at"] = datetime.fromisoformat(
+                    client_data["created_at"]
+                )
+            if isinstance(client_data.get("commission_paid_date"), str):
+                client_data["commission_paid_date"] = datetime.fromisoformat(
+                    client_data["commission_paid_date"]
+                )
+            if isinstance(client_data.get("status"), str):
+                try:
+                    client_data["status"] = ClientStatus(client_data["status"])
+                except ValueError:
+                    client_data["status"] = ClientStatus.NEW
+            client = ClientModel(**client_data)
+        
+        client_realtor = parse_realtor(client.realtor_id) if client else None
+        return parse_realtor(user_id), client, client_realtor
+    
     async def delete_client(self, client_id: int) -> bool:
         """
         Delete a client.
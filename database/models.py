@@ -7,6 +7,33 @@ from pydantic import BaseModel, Field, validator, field_validator
 from bot.config import ClientStatus
 
 
+def normalize_phone(value: Optional[str]) -> Optional[str]:
+    """Strip separators from a phone number and validate its format.
+    
+    Args:
+        value: Phone number as entered
+        
+    Returns:
+        "+" followed by digits, or None if the value has no digits
+        
+    Raises:
+        ValueError: If the number doesn't start with + or has a wrong length
+    """
+    if value is None:
+        return value
+    
+    # Remove spaces and common separators
+    cleaned = "".join(c for c in value if c.isdigit() or c == "+")
+    
+    # Basic validation: should start with + and have 10-15 digits
+    if cleaned and not (cleaned.startswith("+") and 10 <= len(cleaned) <= 16):
+        raise ValueError(
+            "Phone must start with + and contain 10-15 digits"
+        )
+    
+    return cleaned or None
+
+
 class RealtorModel(BaseModel):
     """Realtor account data with validation."""
     
@@ -76,19 +103,7 @@ class RealtorModel(BaseModel):
     @classmethod
     def validate_phone(cls, v: Optional[str]) -> Optional[str]:
         """Validate phone number format."""
-        if v is None:
-            return v
-        
-        # Remove spaces and common separators
-        cleaned = "".join(c for c in v if c.isdigit() or c == "+")
-        
-        # Basic validation: should start with + and have 10-15 digits
-        if cleaned and not (cleaned.startswith("+") and 10 <= len(cleaned) <= 16):
-            raise ValueError(
-                "Phone must start with + and contain 10-15 digits"
-            )
-        
-        return cleaned or None
+        return normalize_phone(v)
 
 
 class ClientModel(BaseModel):
@@ -119,8 +134,10 @@ class ClientModel(BaseModel):
         default_factory=datetime.now,
         description="Lead creation timestamp"
     )
+    # Stored as the plain value (use_enum_values); repositories map unknown
+    # values to NEW when loading, so readers never need to normalize it
     status: ClientStatus = Field(
-        default=ClientStatus.NEW,
+        default=ClientStatus.NEW.value,
         description="Lead status"
     )
     commission_amount: Optional[float] = Field(
@@ -228,6 +245,7 @@ class ConversationContextModel(BaseModel):
 
 # Export models
 __all__ = [
+    "normalize_phone",
     "RealtorModel",
     "ClientModel",
     "ConversationContextModel",
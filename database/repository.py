@@ -1,6 +1,8 @@
 """Repository pattern for database operations."""
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from database.models import RealtorModel, ClientModel
 
@@ -47,9 +49,11 @@ class BaseRepository(ABC):
     async def get_clients_by_realtor(
         self,
         realtor_id: int,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[ClientModel]:
-        """Get all clients for a realtor, optionally filtered by status."""
+        """Get clients for a realtor, optionally filtered by status and paginated."""
         pass
     
     @abstractmethod
@@ -74,5 +78,72 @@ class BaseRepository(ABC):
         """Delete a client."""
         pass
 
+    async def realtor_exists(self, realtor_id: int) -> bool:
+        """Check whether a realtor is registered.
+
+        Backends should override this with an existence query instead of
+        loading the full record.
+        """
+        return (await self.get_realtor(realtor_id)) is not None
+
+    async def update_client_fields(self, client_id: int, **fields: Any) -> bool:
+        """Update selected client fields.
+
+        The merged record is validated like a newly built `ClientModel`.
+
+        Returns:
+            True if the client exists and was updated. Backends should
+            override this with a partial update.
+        """
+        client = await self.get_client(client_id)
+        if not client:
+            return False
+        await self.update_client(ClientModel.model_validate({**client.model_dump(), **fields}))
+        return True
+    
+    async def bulk_update_client_status(self, statuses: Dict[int, str]) -> Set[int]:
+        """Set the status of several clients.
+
+        Args:
+            statuses: Mapping of client ID to new status value.
+
+        Returns:
+            IDs of the clients that exist and were updated. Backends should
+            override this with a single write.
+        """
+        updated = set()
+        for client_id, status in statuses.items():
+            if await self.update_client_fields(client_id, status=status):
+                updated.add(client_id)
+        return updated
+    
+    async def count_clients_by_status(self, realtor_id: int) -> Dict[str, int]:
+        """Count a realtor's clients per status.
+
+        Returns:
+            Mapping of status value to client count. Backends should override
+            this with an aggregate query.
+        """
+        clients = await self.get_clients_by_realtor(realtor_id)
+        return dict(Counter(c.status for c in clients))
+    
+    async def resolve_start_context(
+        self,
+        user_id: int
+    ) -> Tuple[Optional[RealtorModel], Optional[ClientModel], Optional[RealtorModel]]:
+        """Get everything /start needs for a Telegram user.
+
+        Returns:
+            (realtor registered under `user_id`, existing client with that
+            Telegram ID, realtor of that client). Backends should override this
+            with a single query.
+        """
+        realtor, client = await asyncio.gather(
+            self.get_realtor(user_id),
+            self.get_client_by_telegram_global(user_id),
+        )
+        client_realtor = await self.get_realtor(client.realtor_id) if client else None
+        return realtor, client, client_realtor
+
 
 __all__ = ["BaseRepository"]
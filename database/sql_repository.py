@@ -48,7 +48,11 @@ class SQLRepository(BaseRepository):
         raise NotImplementedError
 
     async def get_clients_by_realtor(
-        self, realtor_id: int, status: Optional[str] = None
+        self,
+        realtor_id: int,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[ClientModel]:
         raise NotImplementedError
 
@@ -192,8 +192,9 @@ class InventoryMatcher:
             # Now get inventory data (will use fresh scan results)
             raw_data = self.drive_manager.get_inventory_data(use_cache=False)
             
-            # Filter out sold/booked apartments
-            self.inventory_cache = {}
+            # Filter out sold/booked apartments. Built aside and swapped in with
+            # one assignment so readers never see a partially filled cache.
+            inventory: Dict[str, pd.DataFrame] = {}
             total_before = 0
             total_after = 0
             
@@ -202,11 +203,12 @@ class InventoryMatcher:
                     total_before += len(df)
                     filtered_df = self._filter_available(df)
                     total_after += len(filtered_df)
-                    self.inventory_cache[developer_name] = filtered_df
+                    inventory[developer_name] = filtered_df
             
+            self.inventory_cache = inventory
             self.last_update = datetime.now()
             
-            logger.info(f"Inventory refreshed: {len(self.inventory_cache)} developers, "
+            logger.info(f"Inventory refreshed: {len(inventory)} developers, "
                        f"{total_after} available (filtered {total_before - total_after} sold/booked)")
             return True
 
@@ -17,6 +17,7 @@ from pathlib import Path
 
 from telegram import Update
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CallbackQueryHandler,
     CommandHandler,
@@ -26,6 +27,7 @@ from telegram.ext import (
     filters,
 )
 
+from bot import status_writer
 from bot.config import settings
 from bot.handlers import (
     start_command,
@@ -52,7 +54,9 @@ from bot.handlers import (
     STATE_REALTOR_COMPANY,
     STATE_CLIENT_COMPLETE,
 )
+from bot.client_handlers import ClientInfoDraft
 from bot.drive_handlers import search_followup_handler
+from core import dispatch
 
 
 logger = logging.getLogger(__name__)
@@ -68,19 +72,7 @@ async def _restore_client_from_database(context: ContextTypes.DEFAULT_TYPE, repo
         return False
     
     # Restore client info from database
-    context.user_data["client_info"] = {
-        "telegram_id": existing_client.telegram_id,
-        "telegram_username": existing_client.telegram_username,
-        "name": existing_client.name,
-        "realtor_id": existing_client.realtor_id,
-        "budget": existing_client.budget,
-        "size": existing_client.size,
-        "location": existing_client.location,
-        "rooms": existing_client.rooms,
-        "ready_status": existing_client.ready_status,
-        "notes": existing_client.notes,
-        "contact": existing_client.contact,
-    }
+    context.user_data["client_info"] = ClientInfoDraft.from_client(existing_client)
     
     # Reconstruct conversation history
     realtor = await repo.get_realtor(existing_client.realtor_id)
@@ -89,27 +81,9 @@ async def _restore_client_from_database(context: ContextTypes.DEFAULT_TYPE, repo
         {"role": "system", "content": f"Риелтор: {realtor_name}"}
     ]
     
-    # Add client criteria to conversation so LLM knows what was discussed
-    client_summary = []
-    if existing_client.budget:
-        client_summary.append(f"Бюджет: {existing_client.budget}")
-    if existing_client.size:
-        client_summary.append(f"Площадь: {existing_client.size}")
-    if existing_client.location:
-        client_summary.append(f"Район: {existing_client.location}")
-    if existing_client.rooms:
-        client_summary.append(f"Комнаты: {existing_client.rooms}")
-    if existing_client.ready_status:
-        client_summary.append(f"Стадия: {existing_client.ready_status}")
-    if existing_client.notes:
-        client_summary.append(f"Пожелания: {existing_client.notes}")
-    
-    if client_summary:
-        context.user_data["conversation"].append({
-            "role": "user", 
-            "content": f"Я ищу квартиру. {', '.join(client_summary)}"
-        })
-    
+    # Known criteria are passed to the LLM per call (see
+    # `bot.client_handlers._client_memory_message`), keeping this prefix static.
+
     logger.info(f"Restored client {telegram_id} from database after restart")
     return True
 
@@ -187,10 +161,41 @@ async def on_error(update: object, context) -> None:
     logger.error("Unhandled error: %s", context.error, exc_info=True)
 
 
+async def _post_init(application: Application) -> None:
+    """Start background workers once the event loop is running."""
+    status_writer.start()
+
+
+async def _post_stop(application: Application) -> None:
+    """Finish queued handlers while the bot can still send replies."""
+    await dispatch.stop()
+
+
+async def _post_shutdown(application: Application) -> None:
+    """Flush background workers before exit."""
+    await status_writer.stop()
+
+
 def build_application() -> Application:
     """Build and configure the telegram Application."""
 
-    application = Application.builder().token(settings.telegram_bot_token).build()
+    # Queue outgoing Bot API calls under Telegram's global flood limit (~30 msg/s)
+    # instead of running into RetryAfter storms on bursts of realtor notifications.
+    rate_limiter = AIORateLimiter(
+        overall_max_rate=28,
+        overall_time_period=1,
+        max_retries=3,
+    )
+
+    application = (
+        Application.builder()
+        .token(settings.telegram_bot_token)
+        .rate_limiter(rate_limiter)
+        .post_init(_post_init)
+        .post_stop(_post_stop)
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
 
     application.add_error_handler(on_error)
 
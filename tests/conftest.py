@@ -0,0 +1,12 @@
+"""Shared pytest setup."""
+
+import os
+import sys
+from pathlib import Path
+
+
+# Modules are imported from the project root, as in main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# bot.config builds its settings at import; any well-formed token will do
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:test-token")
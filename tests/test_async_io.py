@@ -0,0 +1,46 @@
+"""Tests for atomic file writes."""
+
+import asyncio
+import os
+import stat
+
+import pytest
+
+# The database package imports its pydantic models on import
+pytest.importorskip("pydantic")
+
+from database.async_io import atomic_write_text, write_fsync
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_replaces_content(tmp_path):
+    path = tmp_path / "db.json"
+    path.write_text("old", encoding="utf-8")
+
+    asyncio.run(write_fsync(path, "новое"))
+
+    assert path.read_text(encoding="utf-8") == "новое"
+    assert os.listdir(tmp_path) == ["db.json"]
+
+
+def test_write_keeps_existing_mode(tmp_path):
+    path = tmp_path / "db.json"
+    path.write_text("{}", encoding="utf-8")
+    os.chmod(path, 0o644)
+
+    atomic_write_text(path, '{"a": 1}')
+
+    assert _mode(path) == 0o644
+
+
+def test_new_file_gets_umask_mode(tmp_path):
+    path = tmp_path / "new.json"
+    umask = os.umask(0)
+    os.umask(umask)
+
+    atomic_write_text(path, "{}")
+
+    assert _mode(path) == 0o666 & ~umask
@@ -0,0 +1,52 @@
+"""Tests for the client dialog handlers."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("telegram")
+pytest.importorskip("pydantic_settings")
+
+from bot.client_handlers import _handle_apartment_selection
+
+
+class _Message:
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+def _selection_context():
+    matches = [
+        SimpleNamespace(developer=f"Developer {i}", data={"№": str(100 + i)})
+        for i in (1, 2, 3)
+    ]
+    return SimpleNamespace(user_data={
+        "awaiting_apartment_selection": True,
+        "shown_apartments": matches,
+    })
+
+
+def test_positive_reply_with_number_selects_option():
+    update = SimpleNamespace(effective_message=_Message())
+    context = _selection_context()
+
+    asyncio.run(_handle_apartment_selection(update, context, "2 подошло"))
+
+    assert context.user_data["selected_apartment"]["number"] == 2
+    assert context.user_data["awaiting_contact"] is True
+    assert "awaiting_criteria_update" not in context.user_data
+
+
+def test_nothing_fits_asks_for_new_criteria():
+    update = SimpleNamespace(effective_message=_Message())
+    context = _selection_context()
+    context.user_data["client_info"] = SimpleNamespace(budget="")
+
+    asyncio.run(_handle_apartment_selection(update, context, "ничего не подошло"))
+
+    assert context.user_data["awaiting_criteria_update"] is True
+    assert "selected_apartment" not in context.user_data
@@ -0,0 +1,25 @@
+"""Tests for the regex prefilter."""
+
+import pytest
+
+from utils.extractors import regex_extract, unrecognised_word_count
+
+
+@pytest.mark.parametrize("text", ["Я готов", "Готовы начать?", "готова ответить"])
+def test_plain_readiness_words_are_not_ready_status(text):
+    assert "ready_status" not in regex_extract(text)
+
+
+@pytest.mark.parametrize("text", ["нужна готовая квартира", "готовое жильё", "дом сдан", "котлован"])
+def test_property_readiness_is_ready_status(text):
+    assert "ready_status" in regex_extract(text)
+
+
+def test_unrecognised_word_count_ignores_recognised_values():
+    text = "2 спальни 70 м2"
+    assert unrecognised_word_count(text, regex_extract(text)) == 0
+
+
+def test_unrecognised_word_count_counts_other_words():
+    text = "бюджет 150000$, но хочу у моря"
+    assert unrecognised_word_count(text, regex_extract(text)) == 5
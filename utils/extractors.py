@@ -0,0 +1,116 @@
+"""Deterministic (regex-based) extraction of client requirements.
+
+Used as a cheap prefilter before the LLM extraction: most client messages
+contain a plain phone number, budget figure or room count, which are
+recognised here and passed to the LLM as already known.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Mapping
+
+
+# Fields that must be known before the dialog can be considered complete
+# (same criteria the LLM extraction prompt uses for `is_complete`).
+REQUIRED_FIELDS: tuple[str, ...] = ("budget", "size", "location", "rooms", "ready_status")
+
+# Fields whose patterns are precise enough to be trusted without the LLM;
+# location and readiness phrases depend on the surrounding dialog.
+CONFIDENT_FIELDS: frozenset[str] = frozenset({"contact", "budget", "size", "rooms"})
+
+_WORD_RE = re.compile(r"\w+")
+
+_PHONE_RE = re.compile(r"\+?\d[\d\s\-()]{7,}\d")
+_USERNAME_RE = re.compile(r"(?<!\w)@[A-Za-z][A-Za-z0-9_]{4,31}\b")
+_BUDGET_RE = re.compile(
+    r"(?:[$€₾]\s*)?\d[\d\s.,]*\d?\s*(?:k|к|тысяч\w*|тыс\.?|млн)?\s*"
+    r"(?:\$|€|₾|usd|eur|gel|долл\w*|евро|лари)"
+    r"|\d{2,}\s?(?:000|k|к|тысяч\w*|тыс\.?)",
+    re.IGNORECASE,
+)
+_SIZE_RE = re.compile(
+    r"\d{2,3}(?:\s*-\s*\d{2,3})?\s*(?:м²|м2|кв\.?\s*м\w*|квадрат\w*|sq\.?\s*m|m2)",
+    re.IGNORECASE,
+)
+_ROOMS_RE = re.compile(
+    r"студи\w*|\d\+?(?:\s*-\s*\d)?\s*(?:спальн\w*|комнат\w*|bedroom\w*)",
+    re.IGNORECASE,
+)
+# "готов" only counts next to a property noun: on its own it is ordinary
+# speech ("я готов", "готовы начать").
+_READY_STATUS_RE = re.compile(
+    r"готов\w*\s+(?:жиль|квартир|объект|дом|к\s+заселени)\w*|сдан\w*|строящ\w*"
+    r"|white\s*frame|black\s*frame|green\s*frame|котлован\w*"
+    r"|под\s+чистов\w*|рассмотр\w*\s+вс[её]",
+    re.IGNORECASE,
+)
+_LOCATION_RE = re.compile(
+    r"стар\w*\s+батуми|нов\w*\s+бульвар\w*|махинджаури|гонио|кобулети|чакви|сарпи",
+    re.IGNORECASE,
+)
+
+# Local numbers without "+" need more digits so that amounts like
+# "1 500 000" are not mistaken for a phone.
+_MIN_PHONE_DIGITS = 9
+_MIN_LOCAL_PHONE_DIGITS = 10
+_MAX_PHONE_DIGITS = 15
+
+
+def _extract_contact(text: str) -> str:
+    for match in _PHONE_RE.finditer(text):
+        candidate = match.group(0).strip()
+        digits = sum(c.isdigit() for c in candidate)
+        min_digits = _MIN_PHONE_DIGITS if candidate.startswith("+") else _MIN_LOCAL_PHONE_DIGITS
+        if min_digits <= digits <= _MAX_PHONE_DIGITS:
+            return candidate
+
+    match = _USERNAME_RE.search(text)
+    return match.group(0) if match else ""
+
+
+def regex_extract(text: str) -> Dict[str, str]:
+    """Extract client requirements that can be recognised without an LLM.
+
+    Args:
+        text: Sanitized client message.
+
+    Returns:
+        Mapping of field name to the matched text; only recognised fields are set.
+    """
+    if not text:
+        return {}
+
+    result: Dict[str, str] = {}
+
+    contact = _extract_contact(text)
+    if contact:
+        result["contact"] = contact
+        # Don't let phone digits be read as a budget figure.
+        text = text.replace(contact, " ")
+
+    for field, pattern in (
+        ("size", _SIZE_RE),
+        ("budget", _BUDGET_RE),
+        ("rooms", _ROOMS_RE),
+        ("ready_status", _READY_STATUS_RE),
+        ("location", _LOCATION_RE),
+    ):
+        match = pattern.search(text)
+        if match:
+            value = match.group(0).strip()
+            result[field] = value
+            if field == "size":
+                text = text.replace(value, " ")
+
+    return result
+
+
+def unrecognised_word_count(text: str, values: Mapping[str, str]) -> int:
+    """Count the words of `text` left once the recognised `values` are removed."""
+    for value in values.values():
+        text = text.replace(value, " ")
+    return len(_WORD_RE.findall(text))
+
+
+__all__ = ["REQUIRED_FIELDS", "CONFIDENT_FIELDS", "regex_extract", "unrecognised_word_count"]
@@ -10,6 +10,12 @@ from typing import Optional
 
 
 _SANITIZE_ALLOWED = re.compile(r"[^\w\s\-+@().,/:#№%&*'\"!?$€₾₽]", re.UNICODE)
+_WHITESPACE_RUN = re.compile(r"\s+")
+# Text that sanitizing would leave unchanged: allowed characters only,
+# single spaces, no other whitespace.
+_SANITIZE_CLEAN = re.compile(r"(?:[\w\-+@().,/:#№%&*'\"!?$€₾₽]| (?! ))*")
+# Characters that are markup in Telegram's HTML parse mode
+_HTML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
 
 
 def sanitize_user_text(text: str, max_len: int = 1000) -> str:
@@ -26,11 +32,28 @@ def sanitize_user_text(text: str, max_len: int = 1000) -> str:
         return ""
 
     cleaned = text.strip()
+    # Fast path: most messages are already clean, and a single match is
+    # cheaper than the two substitutions below.
+    if _SANITIZE_CLEAN.fullmatch(cleaned):
+        return cleaned[:max_len]
+
     cleaned = _SANITIZE_ALLOWED.sub(" ", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned)
+    cleaned = _WHITESPACE_RUN.sub(" ", cleaned)
     return cleaned[:max_len]
 
 
+def escape_html(text: str) -> str:
+    """Escape text for messages sent with `parse_mode="HTML"`.
+
+    Args:
+        text: User-controlled text.
+
+    Returns:
+        Text with HTML markup characters escaped.
+    """
+    return text.translate(_HTML_ESCAPES)
+
+
 def parse_budget_amount(text: str) -> Optional[float]:
     """Parse first numeric value from budget text.
 
@@ -67,4 +90,4 @@ def format_client_summary(client_info: dict) -> str:
     )
 
 
-__all__ = ["sanitize_user_text", "parse_budget_amount", "format_client_summary"]
+__all__ = ["sanitize_user_text", "escape_html", "parse_budget_amount", "format_client_summary"]